@@ -0,0 +1,79 @@
+"""
+Bounded thread pool for CPU-bound token verification.
+
+RS256 signature checks take long enough that a burst of them (e.g. many agents
+reconnecting at once) would stall every request sharing the event loop. They run
+on a small pool of their own instead, sized by AUTH_EXECUTOR_WORKERS (0 runs them
+inline), so a burst queues behind that pool rather than behind in-flight tool
+calls, and never competes with the DB executor for threads.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from dotenv import load_dotenv
+
+load_dotenv(".env.local")
+
+T = TypeVar("T")
+
+def _timed(fn: Callable[..., T], *args: Any, **kwargs: Any) -> Tuple[float, T]:
+    # Runs on the pool; reports when the call left the queue
+    return time.monotonic(), fn(*args, **kwargs)
+
+class AuthExecutor:
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auth") if max_workers > 0 else None
+        )
+        # Counters are only touched on the event loop thread
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `fn(*args, **kwargs)` on the auth pool and await its result"""
+        if self._executor is None:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        submitted_at = time.monotonic()
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            started_at, result = await loop.run_in_executor(
+                self._executor, functools.partial(_timed, fn, *args, **kwargs)
+            )
+        finally:
+            self.pending -= 1
+        wait = started_at - submitted_at
+        self.completed += 1
+        self.total_wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        return result
+
+    async def run_async(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine that does CPU-bound work to completion on the auth pool, on an event loop of its own"""
+        if self._executor is None:
+            return await coro
+        return await self.run(asyncio.run, coro)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth is the number of calls submitted but not yet picked up by a worker"""
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "queue_depth": max(0, self.pending - self.max_workers),
+            "peak_queue_depth": max(0, self.peak_pending - self.max_workers),
+            "completed": self.completed,
+            "avg_wait_ms": self.total_wait_seconds / self.completed * 1000 if self.completed else 0.0,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+        }
+
+auth_executor = AuthExecutor(max_workers=int(os.getenv("AUTH_EXECUTOR_WORKERS", "2")))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Compare ORM hydration against plain column rows for the ticket list query
+
+Seeds a throwaway SQLite database with one organization and N tickets, then
+times `select(Ticket)` + projection against the column select used by
+`crud.get_tickets`, reporting wall time and peak allocation of each.
+
+    python benchmark_list_queries.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+import models
+import pagination
+from crud import _ticket_columns
+
+def seed(engine, rows: int) -> str:
+    org_id = "org-benchmark"
+    with Session(engine) as db:
+        db.execute(insert(models.Organization), [{"id": org_id, "name": "Benchmark"}])
+        db.execute(
+            insert(models.Ticket),
+            [
+                {
+                    "title": f"Ticket {i}",
+                    "assignee": f"user{i % 25}@example.com",
+                    "status": ("backlog", "todo", "in_progress", "done")[i % 4],
+                    "description": "Lorem ipsum dolor sit amet " * 4,
+                    "organization_id": org_id,
+                }
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+    return org_id
+
+def orm_objects(engine, org_id: str) -> list:
+    with Session(engine) as db:
+        tickets = db.scalars(select(models.Ticket).where(models.Ticket.organization_id == org_id)).all()
+        return [pagination.project_row(t, pagination.TICKET_RESPONSE_FIELDS) for t in tickets]
+
+def column_rows(engine, org_id: str) -> list:
+    with Session(engine) as db:
+        rows = db.execute(
+            select(*_ticket_columns(pagination.TICKET_RESPONSE_FIELDS))
+            .where(models.Ticket.organization_id == org_id)
+        ).all()
+        return [pagination.project_row(row, pagination.TICKET_RESPONSE_FIELDS) for row in rows]
+
+def measure(fn, engine, org_id: str, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(engine, org_id)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn(engine, org_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'benchmark.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        org_id = seed(engine, args.rows)
+
+        print(f"{args.rows} tickets, median of {args.repeat} runs")
+        for name, fn in (("ORM objects", orm_objects), ("column rows", column_rows)):
+            seconds, peak = measure(fn, engine, org_id, args.repeat)
+            print(f"  {name:<12} {seconds * 1000:8.1f} ms   peak {peak / 1024 / 1024:6.1f} MiB")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
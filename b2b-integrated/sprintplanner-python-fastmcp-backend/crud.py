@@ -1,38 +1,154 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from typing import List, Optional
+from sqlalchemy import and_, bindparam, delete, func, insert, select, tuple_, update
+from sqlalchemy.engine import Row
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+import functools
+import json
+import threading
 import models
+import pagination
 import schemas
-from database import SessionLocal
+import search
+from database import ReadSessionLocal, on_commit, read_session_scope, session_scope, transaction, upsert_insert
+import events
+import list_cache
+
+T = TypeVar("T")
+
+# Board version operations (a per-organization counter bumped by every ticket write)
+def _bump_board_version(db: Session, org_id: str, op: str, ids: Sequence[str] = ()) -> int:
+    """Bump the board version for a write of `op` ("created", "updated", ...) on tickets `ids`"""
+    table = models.TicketBoardVersion.__table__
+    stmt = upsert_insert(db, table).values(organization_id=org_id, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.organization_id],
+        set_={"version": table.c.version + 1},
+    ).returning(table.c.version)
+    version = db.execute(stmt).scalar_one()
+    # Once the write commits, cached lists of this organization are stale and subscribers are told
+    on_commit(db, functools.partial(list_cache.cache.invalidate, org_id))
+    on_commit(db, functools.partial(events.broker.publish, events.ChangeEvent(org_id, version, op, list(ids))))
+    return version
+
+def _board_version(db: Session, org_id: str) -> int:
+    version = db.execute(
+        select(models.TicketBoardVersion.version).where(models.TicketBoardVersion.organization_id == org_id)
+    ).scalar_one_or_none()
+    return version or 0
+
+def get_board_version(org_id: str) -> int:
+    with read_session_scope() as db:
+        return _board_version(db, org_id)
+
+def with_board_version(org_id: str, write: Callable[..., T], *args: Any) -> Tuple[T, int]:
+    """Call `write(*args)` and return its result with the board version it left, read in the same transaction"""
+    with transaction():
+        return write(*args), get_board_version(org_id)
+
+def _read_through(db: Session, org_id: str, view: str, load: Callable[[], Any]) -> Tuple[Any, int]:
+    """Serve a JSON-ready list view from the list cache if the board version is unchanged.
+
+    Returns the view and the board version it belongs to. A freshly loaded value is
+    cached only once the session commits, so a view read after an uncommitted write
+    is never cached under a version that may roll back.
+    """
+    version = _board_version(db, org_id)
+    value = list_cache.cache.get(org_id, view, version)
+    if value is None:
+        value = load()
+        on_commit(db, functools.partial(list_cache.cache.put, org_id, view, version, value))
+    return value, version
 
 # Organization CRUD operations
 def get_organization(org_id: str) -> Optional[models.Organization]:
-    with SessionLocal() as db:
+    with session_scope() as db:
         return db.query(models.Organization).filter(models.Organization.id == org_id).first()
 
 def create_organization(name: str) -> models.Organization:
-    with SessionLocal() as db:
+    with session_scope() as db:
         db_org = models.Organization(name=name)
         db.add(db_org)
-        db.commit()
-        db.refresh(db_org)
+        db.flush()
         return db_org
 
 def get_or_create_organization(org_id: str, name: str = "Default Organization") -> models.Organization:
     """Get existing organization or create a new one"""
-    with SessionLocal() as db:
+    with session_scope() as db:
         org = db.query(models.Organization).filter(models.Organization.id == org_id).first()
         if not org:
             org = models.Organization(id=org_id, name=name)
             db.add(org)
-            db.commit()
-            db.refresh(org)
+            db.flush()
         return org
 
+# Organizations known to exist in this process, so the hot path can skip the existence check
+KNOWN_ORGANIZATIONS_MAX = 10_000
+_known_organizations: "OrderedDict[str, None]" = OrderedDict()
+_known_organizations_lock = threading.Lock()
+
+def ensure_organization(org_id: str, name: str = "Default Organization") -> None:
+    """Make sure an organization row exists, touching the database at most once per org per process"""
+    with _known_organizations_lock:
+        if org_id in _known_organizations:
+            _known_organizations.move_to_end(org_id)
+            return
+
+    with session_scope() as db:
+        stmt = upsert_insert(db, models.Organization.__table__).values(id=org_id, name=name)
+        db.execute(stmt.on_conflict_do_nothing(index_elements=["id"]))
+        # Only remember the org once the insert is durable
+        on_commit(db, lambda: _remember_organization(org_id))
+
+def _remember_organization(org_id: str) -> None:
+    with _known_organizations_lock:
+        _known_organizations[org_id] = None
+        while len(_known_organizations) > KNOWN_ORGANIZATIONS_MAX:
+            _known_organizations.popitem(last=False)
+
+def forget_organization(org_id: str) -> None:
+    """Drop an organization from the known-org cache (call after deleting it)"""
+    with _known_organizations_lock:
+        _known_organizations.pop(org_id, None)
+
 # Ticket CRUD operations
-def get_tickets(org_id: str) -> List[models.Ticket]:
-    with SessionLocal() as db:
-        return db.query(models.Ticket).filter(models.Ticket.organization_id == org_id).all()
+# Order of every ticket list (and the keyset pagination key). Lists must not rely on
+# the implicit row order: SQLite returns insertion order, Postgres makes no promise.
+TICKET_ORDER = (models.Ticket.created_at, models.Ticket.id)
+
+def _ticket_columns(fields: Sequence[str]) -> list:
+    return [getattr(models.Ticket, field) for field in fields]
+
+def get_tickets(org_id: str) -> List[Dict[str, Any]]:
+    """All tickets of the organization as JSON-ready `TicketResponse` dicts (cached per board version)"""
+    with read_session_scope() as db:
+        def load():
+            # Read-only: select plain rows instead of hydrating Ticket instances
+            rows = db.execute(
+                select(*_ticket_columns(pagination.TICKET_RESPONSE_FIELDS))
+                .where(models.Ticket.organization_id == org_id)
+                .order_by(*TICKET_ORDER)
+            ).all()
+            return [pagination.project_row(row, pagination.TICKET_RESPONSE_FIELDS) for row in rows]
+
+        tickets, _ = _read_through(db, org_id, "tickets", load)
+        return tickets
+
+def _ticket_filters(
+    org_id: str,
+    status: Optional[str] = None,
+    assignee: Optional[str] = None,
+    title_contains: Optional[str] = None,
+) -> list:
+    filters = [models.Ticket.organization_id == org_id]
+    if status:
+        filters.append(models.Ticket.status == status)
+    if assignee:
+        filters.append(func.lower(models.Ticket.assignee) == assignee.lower())
+    if title_contains:
+        filters.append(func.lower(models.Ticket.title).contains(title_contains.lower()))
+    return filters
 
 def search_tickets(
     org_id: str,
@@ -41,26 +157,97 @@ def search_tickets(
     title_contains: Optional[str] = None,
 ) -> List[models.Ticket]:
     """Search tickets for an organization using DB-side filtering."""
-    with SessionLocal() as db:
-        query = db.query(models.Ticket).filter(models.Ticket.organization_id == org_id)
+    with read_session_scope() as db:
+        return db.query(models.Ticket).filter(
+            *_ticket_filters(org_id, status=status, assignee=assignee, title_contains=title_contains)
+        ).order_by(*TICKET_ORDER).all()
+
+def full_text_search_tickets(
+    org_id: str,
+    search_text: str,
+    status: Optional[str] = None,
+    assignee: Optional[str] = None,
+    limit: int = pagination.DEFAULT_PAGE_SIZE,
+) -> List[Row]:
+    """Rank an organization's tickets by full-text relevance of title and description."""
+    with read_session_scope() as db:
+        stmt = search.get_search_backend(db.get_bind().dialect.name).query(org_id, search_text)
+        if stmt is None:
+            return []
+        stmt = stmt.where(*_ticket_filters(org_id, status=status, assignee=assignee)).limit(limit)
+        # Read-only: plain rows carrying every ticket column, no Ticket instances
+        return db.execute(stmt.with_only_columns(*models.Ticket.__table__.columns)).all()
+
+def get_tickets_page(
+    org_id: str,
+    limit: int,
+    after: Optional[Tuple[datetime, str]] = None,
+    fields: Sequence[str] = pagination.TICKET_FIELDS,
+    status: Optional[str] = None,
+    assignee: Optional[str] = None,
+    title_contains: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Fetch one page of tickets ordered by (created_at, id), selecting only the requested columns.
+
+    Returns `{"tickets": [...], "next_cursor": ..., "version": ...}`, where `next_cursor`
+    is None on the last page and `version` is the board version the page was read at.
+    Pages are cached per board version.
+    """
+    columns = {"id": models.Ticket.id, "created_at": models.Ticket.created_at}
+    columns.update({field: getattr(models.Ticket, field) for field in fields})
+
+    stmt = select(*columns.values()).where(
+        *_ticket_filters(org_id, status=status, assignee=assignee, title_contains=title_contains)
+    )
+    if after:
+        stmt = stmt.where(tuple_(models.Ticket.created_at, models.Ticket.id) > after)
+    stmt = stmt.order_by(*TICKET_ORDER).limit(limit + 1)
+
+    view = "page:" + json.dumps(
+        [limit, after and [after[0].isoformat(), after[1]], list(fields), status, assignee, title_contains]
+    )
+    with read_session_scope() as db:
+        def load():
+            rows = db.execute(stmt).all()
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = pagination.encode_cursor(rows[-1].created_at, rows[-1].id)
+            return {
+                "tickets": [pagination.project_row(row, fields) for row in rows],
+                "next_cursor": next_cursor,
+            }
 
-        if status:
-            query = query.filter(models.Ticket.status == status)
-        if assignee:
-            query = query.filter(func.lower(models.Ticket.assignee) == assignee.lower())
-        if title_contains:
-            query = query.filter(func.lower(models.Ticket.title).contains(title_contains.lower()))
+        page, version = _read_through(db, org_id, view, load)
+        return {**page, "version": version}
 
-        return query.all()
+def get_ticket_statistics(org_id: str) -> dict:
+    """Count an organization's tickets by status and by assignee with GROUP BY queries."""
+    with read_session_scope() as db:
+        status_counts = dict(db.execute(
+            select(models.Ticket.status, func.count())
+            .where(models.Ticket.organization_id == org_id)
+            .group_by(models.Ticket.status)
+        ).all())
+        assignee_counts = dict(db.execute(
+            select(models.Ticket.assignee, func.count())
+            .where(models.Ticket.organization_id == org_id)
+            .group_by(models.Ticket.assignee)
+        ).all())
+    return {
+        "total_tickets": sum(status_counts.values()),
+        "status_distribution": status_counts,
+        "assignee_distribution": assignee_counts,
+    }
 
 def get_ticket(ticket_id: str, org_id: str) -> Optional[models.Ticket]:
-    with SessionLocal() as db:
+    with session_scope() as db:
         return db.query(models.Ticket).filter(
             and_(models.Ticket.id == ticket_id, models.Ticket.organization_id == org_id)
         ).first()
 
 def create_ticket(ticket: schemas.TicketCreate, org_id: str) -> models.Ticket:
-    with SessionLocal() as db:
+    with session_scope() as db:
         db_ticket = models.Ticket(
             title=ticket.title,
             assignee=ticket.assignee,
@@ -68,23 +255,23 @@ def create_ticket(ticket: schemas.TicketCreate, org_id: str) -> models.Ticket:
             organization_id=org_id
         )
         db.add(db_ticket)
-        db.commit()
-        db.refresh(db_ticket)
+        db.flush()
+        _bump_board_version(db, org_id, "created", [db_ticket.id])
         return db_ticket
 
 def update_ticket_status(ticket_id: str, status: str, org_id: str) -> Optional[models.Ticket]:
-    with SessionLocal() as db:
+    with session_scope() as db:
         ticket = db.query(models.Ticket).filter(
             and_(models.Ticket.id == ticket_id, models.Ticket.organization_id == org_id)
         ).first()
         if ticket:
             ticket.status = status
-            db.commit()
-            db.refresh(ticket)
+            _bump_board_version(db, org_id, "updated", [ticket.id])
+            db.flush()
         return ticket
 
 def update_ticket(ticket_id: str, ticket_update: schemas.TicketUpdate, org_id: str) -> Optional[models.Ticket]:
-    with SessionLocal() as db:
+    with session_scope() as db:
         ticket = db.query(models.Ticket).filter(
             and_(models.Ticket.id == ticket_id, models.Ticket.organization_id == org_id)
         ).first()
@@ -92,18 +279,128 @@ def update_ticket(ticket_id: str, ticket_update: schemas.TicketUpdate, org_id: s
             update_data = ticket_update.dict(exclude_unset=True)
             for field, value in update_data.items():
                 setattr(ticket, field, value)
-            db.commit()
-            db.refresh(ticket)
+            _bump_board_version(db, org_id, "updated", [ticket.id])
+            db.flush()
         return ticket
 
 def delete_ticket(ticket_id: str, org_id: str) -> bool:
-    with SessionLocal() as db:
+    with session_scope() as db:
         ticket = db.query(models.Ticket).filter(
             and_(models.Ticket.id == ticket_id, models.Ticket.organization_id == org_id)
         ).first()
         if ticket:
             db.delete(ticket)
-            db.commit()
+            _bump_board_version(db, org_id, "deleted", [ticket.id])
+            db.flush()
             return True
         return False
 
+
+# Batch ticket operations: one transaction and one executemany statement per call
+def create_tickets(tickets: Sequence[schemas.TicketCreate], org_id: str) -> List[models.Ticket]:
+    """Insert several tickets at once, returned in input order"""
+    with session_scope() as db:
+        created = db.scalars(
+            insert(models.Ticket).returning(models.Ticket, sort_by_parameter_order=True),
+            [
+                {
+                    "title": ticket.title,
+                    "assignee": ticket.assignee,
+                    "description": ticket.description,
+                    "organization_id": org_id,
+                }
+                for ticket in tickets
+            ],
+        ).all()
+        if created:
+            _bump_board_version(db, org_id, "created", [ticket.id for ticket in created])
+        db.flush()
+        return created
+
+def update_ticket_statuses(changes: Sequence[Tuple[str, str]], org_id: str) -> Dict[str, models.Ticket]:
+    """Apply (ticket_id, status) pairs; returns the updated tickets of the org keyed by ID"""
+    ticket_ids = [ticket_id for ticket_id, _ in changes]
+    with session_scope() as db:
+        existing = set(db.scalars(
+            select(models.Ticket.id).where(
+                models.Ticket.organization_id == org_id, models.Ticket.id.in_(ticket_ids)
+            )
+        ))
+        params = [
+            {"target_id": ticket_id, "new_status": status}
+            for ticket_id, status in changes
+            if ticket_id in existing
+        ]
+        if not params:
+            return {}
+
+        table = models.Ticket.__table__
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("target_id"), table.c.organization_id == org_id)
+            .values(status=bindparam("new_status"), updated_at=func.now()),
+            params,
+        )
+        _bump_board_version(db, org_id, "updated", [ticket_id for ticket_id, _ in changes if ticket_id in existing])
+        db.flush()
+
+        updated = db.scalars(
+            select(models.Ticket)
+            .where(models.Ticket.id.in_(existing))
+            .execution_options(populate_existing=True)
+        )
+        return {ticket.id: ticket for ticket in updated}
+
+def delete_tickets(ticket_ids: Sequence[str], org_id: str) -> List[str]:
+    """Delete tickets of the org; returns the IDs that were actually deleted"""
+    with session_scope() as db:
+        table = models.Ticket.__table__
+        deleted = list(db.scalars(
+            delete(table)
+            .where(table.c.organization_id == org_id, table.c.id.in_(ticket_ids))
+            .returning(table.c.id)
+        ))
+        if deleted:
+            _bump_board_version(db, org_id, "deleted", deleted)
+        db.flush()
+        return deleted
+
+# Bulk import and export
+def import_tickets(tickets: Sequence[schemas.TicketImport], org_id: str) -> int:
+    """Insert a chunk of imported tickets with one executemany INSERT; returns the number inserted"""
+    if not tickets:
+        return 0
+    with session_scope() as db:
+        db.execute(
+            insert(models.Ticket.__table__),
+            [
+                {
+                    "title": ticket.title,
+                    "assignee": ticket.assignee,
+                    "status": ticket.status,
+                    "description": ticket.description,
+                    "organization_id": org_id,
+                }
+                for ticket in tickets
+            ],
+        )
+        # Imported IDs are generated by the INSERT itself; subscribers refetch the list
+        _bump_board_version(db, org_id, "imported")
+        return len(tickets)
+
+def iter_ticket_batches(org_id: str, batch_size: int = 1000) -> Iterator[List[Row]]:
+    """Yield every ticket of an organization in (created_at, id) order, `batch_size` rows at a time.
+
+    Rows are read through a server-side cursor, so memory use does not grow with
+    the organization's size. The generator is resumed from different executor
+    calls, so it opens its own session instead of joining a unit of work.
+    """
+    stmt = (
+        select(*_ticket_columns(pagination.TICKET_FIELDS))
+        .where(models.Ticket.organization_id == org_id)
+        .order_by(*TICKET_ORDER)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+    with ReadSessionLocal() as db:
+        for partition in db.execute(stmt).partitions():
+            yield partition
@@ -0,0 +1,20 @@
+"""
+Strong ETags for per-tenant list responses, derived from the tenant's write version
+"""
+
+import hashlib
+
+from fastapi import Request
+
+def make_etag(tenant: str, version: int) -> str:
+    """The list of a tenant changes only when its version is bumped, so (tenant, version) identifies it"""
+    tenant_digest = hashlib.sha256(tenant.encode()).hexdigest()[:16]
+    return f'"{tenant_digest}-{version}"'
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header matches `etag` (weak comparison, per RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in (c.removeprefix("W/") for c in candidates)
@@ -0,0 +1,307 @@
+"""
+Per-tenant change events, MCP resource subscriptions and the SSE change feed.
+
+Every committed write publishes a `ChangeEvent` on the change broker. MCP
+sessions that subscribed to a tenant's resources receive a `resources/updated`
+notification for each subscribed URI, and REST clients can follow the same
+events as Server-Sent Events, resuming from a bounded per-tenant change log.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from mcp.server.models import InitializationOptions
+from pydantic import AnyUrl
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ChangeEvent:
+    """One committed write: the tenant's new version, what happened and to which IDs"""
+    tenant: str
+    version: int
+    op: str  # "created", "updated", "deleted" or "imported"
+    ids: List[str] = field(default_factory=list)
+
+Listener = Callable[[ChangeEvent], None]
+
+class ChangeLog:
+    """The most recent events of each tenant, for resuming a change feed"""
+
+    def __init__(self, maxlen: int = 100, max_tenants: int = 10_000):
+        self.maxlen = maxlen
+        self.max_tenants = max_tenants
+        self._events: "OrderedDict[str, Deque[ChangeEvent]]" = OrderedDict()
+
+    def append(self, event: ChangeEvent) -> None:
+        events = self._events.get(event.tenant)
+        if events is None:
+            events = self._events[event.tenant] = deque(maxlen=self.maxlen)
+        self._events.move_to_end(event.tenant)
+        events.append(event)
+        while len(self._events) > self.max_tenants:
+            self._events.popitem(last=False)
+
+    def since(self, tenant: str, version: int) -> Optional[List[ChangeEvent]]:
+        """Events after `version`, or None if some of them are no longer in the log"""
+        events = [event for event in self._events.get(tenant, ()) if event.version > version]
+        if events and events[0].version > version + 1:
+            return None
+        return events
+
+class ChangeBroker:
+    """Fan-out of per-tenant change events. Listeners may be called from any thread."""
+
+    log: ChangeLog
+
+    def publish(self, event: ChangeEvent) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, tenant: str, listener: Listener) -> Callable[[], None]:
+        """Call `listener(event)` on every change of `tenant`; returns the unsubscribe function"""
+        raise NotImplementedError
+
+class InProcessChangeBroker(ChangeBroker):
+    """Thread-safe broker for listeners in this process"""
+
+    def __init__(self, log_size: int = 100):
+        self.log = ChangeLog(maxlen=log_size)
+        self._listeners: Dict[str, List[Listener]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, event: ChangeEvent) -> None:
+        self._deliver(event)
+
+    def _deliver(self, event: ChangeEvent) -> None:
+        with self._lock:
+            self.log.append(event)
+            listeners = list(self._listeners.get(event.tenant, ()))
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Change listener failed for tenant %s", event.tenant)
+
+    def subscribe(self, tenant: str, listener: Listener) -> Callable[[], None]:
+        with self._lock:
+            self._listeners.setdefault(tenant, []).append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                listeners = self._listeners.get(tenant, [])
+                if listener in listeners:
+                    listeners.remove(listener)
+                if not listeners:
+                    self._listeners.pop(tenant, None)
+
+        return unsubscribe
+
+class RedisChangeBroker(InProcessChangeBroker):
+    """Relays change events between workers over a Redis pub/sub channel.
+
+    Local listeners are notified when the event comes back from Redis, so every
+    worker (including the publishing one) delivers each change exactly once.
+    """
+
+    def __init__(self, client: Any, channel: str = "ticket-changes", log_size: int = 100):
+        super().__init__(log_size=log_size)
+        self.client = client
+        self.channel = channel
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{channel: self._on_message})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def publish(self, event: ChangeEvent) -> None:
+        self.client.publish(self.channel, json.dumps(asdict(event)))
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        self._deliver(ChangeEvent(**json.loads(message["data"])))
+
+def broker_from_env() -> ChangeBroker:
+    """Use Redis pub/sub when CHANGE_BROKER_REDIS_URL is set (requires the `redis` package)"""
+    log_size = int(os.getenv("CHANGE_LOG_SIZE", "100"))
+    redis_url = os.getenv("CHANGE_BROKER_REDIS_URL")
+    if redis_url:
+        import redis
+
+        return RedisChangeBroker(redis.Redis.from_url(redis_url), log_size=log_size)
+    return InProcessChangeBroker(log_size=log_size)
+
+broker = broker_from_env()
+
+class ResourceSubscriptions:
+    """Tracks the resource URIs each MCP session subscribed to and pushes `resources/updated`.
+
+    Each session holds one broker subscription per tenant. Notifications are sent on
+    the event loop that handled the subscribe request. Sessions are held weakly, so
+    a session that closes without unsubscribing drops its subscriptions once it is
+    collected; one whose notification fails (e.g. it disconnected) is dropped at once.
+    """
+
+    def __init__(self, broker: ChangeBroker):
+        self.broker = broker
+        # session -> (tenant, subscribed URIs, broker unsubscribe, finalizer)
+        self._sessions: "weakref.WeakKeyDictionary[Any, Tuple[str, Set[str], Callable[[], None], weakref.finalize]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def subscribe(self, session: Any, tenant: str, uri: str) -> None:
+        entry = self._sessions.get(session)
+        if entry is None:
+            loop = asyncio.get_running_loop()
+            session_ref = weakref.ref(session)
+
+            def on_change(_event: ChangeEvent) -> None:
+                if session_ref() is None:
+                    unsubscribe()
+                    return
+                asyncio.run_coroutine_threadsafe(self._notify(session_ref), loop)
+
+            unsubscribe = self.broker.subscribe(tenant, on_change)
+            finalizer = weakref.finalize(session, _unsubscribe_later, loop, unsubscribe)
+            entry = (tenant, set(), unsubscribe, finalizer)
+            self._sessions[session] = entry
+        entry[1].add(uri)
+
+    def unsubscribe(self, session: Any, uri: str) -> None:
+        entry = self._sessions.get(session)
+        if entry is None:
+            return
+        entry[1].discard(uri)
+        if not entry[1]:
+            self._drop(session)
+
+    def _drop(self, session: Any) -> None:
+        entry = self._sessions.pop(session, None)
+        if entry is not None:
+            entry[3].detach()
+            entry[2]()
+
+    async def _notify(self, session_ref: "weakref.ref[Any]") -> None:
+        session = session_ref()
+        entry = self._sessions.get(session) if session is not None else None
+        if entry is None:
+            return
+        try:
+            for uri in list(entry[1]):
+                await session.send_resource_updated(AnyUrl(uri))
+        except Exception:
+            logger.debug("Dropping resource subscriptions of a closed MCP session")
+            self._drop(session)
+
+    def install(self, mcp: Any, get_tenant: Callable[[], str]) -> None:
+        """Register subscribe/unsubscribe handlers on a FastMCP server and advertise the capability"""
+        server = mcp._mcp_server
+
+        @server.subscribe_resource()
+        async def handle_subscribe(uri: AnyUrl) -> None:
+            self.subscribe(server.request_context.session, get_tenant(), str(uri))
+
+        @server.unsubscribe_resource()
+        async def handle_unsubscribe(uri: AnyUrl) -> None:
+            self.unsubscribe(server.request_context.session, str(uri))
+
+        # The SDK always reports resources.subscribe=false, and clients only subscribe
+        # when the server says it can; every transport builds its initialize response here
+        create_initialization_options = server.create_initialization_options
+
+        def create_initialization_options_with_subscribe(*args: Any, **kwargs: Any) -> InitializationOptions:
+            options = create_initialization_options(*args, **kwargs)
+            if options.capabilities.resources is not None:
+                options.capabilities.resources.subscribe = True
+            return options
+
+        server.create_initialization_options = create_initialization_options_with_subscribe
+
+def _unsubscribe_later(loop: asyncio.AbstractEventLoop, unsubscribe: Callable[[], None]) -> None:
+    # Runs from the garbage collector, possibly while this thread holds the broker's
+    # lock, so the broker subscription is ended on the loop instead
+    try:
+        loop.call_soon_threadsafe(unsubscribe)
+    except RuntimeError:
+        # The loop is closed; the listener removes itself on the tenant's next change
+        pass
+
+# Seconds of silence after which the change feed sends a keep-alive comment
+HEARTBEAT_SECONDS = 15.0
+# Events buffered per connection; a client that falls further behind gets a reset
+STREAM_QUEUE_SIZE = 100
+
+def _sse(event: str, version: int, data: Dict[str, Any]) -> str:
+    return f"id: {version}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+def _change(event: ChangeEvent) -> str:
+    return _sse("change", event.version, {"version": event.version, "op": event.op, "ids": event.ids})
+
+def _reset(version: int) -> str:
+    return _sse("reset", version, {"version": version})
+
+async def change_stream(
+    broker: ChangeBroker,
+    tenant: str,
+    get_version: Callable[[], Awaitable[int]],
+    last_event_id: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """Server-Sent Events for a tenant's changes.
+
+    `get_version` reads the tenant's current version; it is called once the stream
+    has subscribed, so a write committed around that read is either covered by the
+    version or delivered as an event. Event IDs are list versions. A client reconnecting with `Last-Event-ID` gets the
+    events it missed from the change log; if they are no longer there (or it fell
+    more than STREAM_QUEUE_SIZE events behind) it gets a `reset` event and should
+    refetch the full list.
+    """
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[ChangeEvent]" = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    # Latest version dropped because the queue was full (0 if none)
+    overflowed = 0
+
+    def offer(event: ChangeEvent) -> None:
+        nonlocal overflowed
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            overflowed = max(overflowed, event.version)
+
+    # Subscribe before reading the version and the log so no event falls between them
+    unsubscribe = broker.subscribe(tenant, lambda event: loop.call_soon_threadsafe(offer, event))
+    try:
+        current_version = await get_version()
+        yield "retry: 3000\n\n"
+        last = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+        backlog = broker.log.since(tenant, last) if last is not None else None
+        if last is None:
+            yield _sse("ready", current_version, {"version": current_version})
+            sent = current_version
+        elif backlog is None or max([last] + [event.version for event in backlog]) < current_version:
+            yield _reset(current_version)
+            sent = current_version
+        else:
+            for event in backlog:
+                yield _change(event)
+            sent = max([last] + [event.version for event in backlog])
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if overflowed:
+                while not queue.empty():
+                    queue.get_nowait()
+                sent = max(sent, overflowed)
+                overflowed = 0
+                yield _reset(sent)
+            elif event.version > sent:
+                sent = event.version
+                yield _change(event)
+    finally:
+        unsubscribe()
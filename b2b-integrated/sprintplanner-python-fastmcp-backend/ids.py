@@ -0,0 +1,51 @@
+"""
+Collision-free, time-ordered primary key generation
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Callable
+
+class UUIDv7Generator:
+    """Generates UUIDv7 strings that sort by creation time and never repeat within a process.
+
+    The 48-bit millisecond timestamp is followed by a 12-bit counter that increments
+    for IDs created in the same millisecond (borrowing from the next millisecond if it
+    overflows), plus 62 random bits that keep IDs from different processes apart.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._counter = 0
+
+    def __call__(self) -> str:
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                # Random start, leaving half the counter space for same-millisecond IDs
+                self._counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+            else:
+                self._counter += 1
+                if self._counter > 0xFFF:
+                    self._last_ms += 1
+                    self._counter = 0
+            timestamp_ms, counter = self._last_ms, self._counter
+
+        random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+        value = (timestamp_ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | random_bits
+        return str(uuid.UUID(int=value))
+
+_generator: Callable[[], str] = UUIDv7Generator()
+
+def generate_id() -> str:
+    """Return a new primary key from the configured generator"""
+    return _generator()
+
+def set_id_generator(generator: Callable[[], str]) -> None:
+    """Swap the ID generator, e.g. for deterministic IDs in tests"""
+    global _generator
+    _generator = generator
@@ -4,6 +4,7 @@ Database initialization script for the Ticket Board application
 """
 
 from database import engine
+from search import install_search_index
 import models
 import crud
 import schemas
@@ -17,6 +18,10 @@ def init_db():
     print("Creating database tables...")
     models.Base.metadata.create_all(bind=engine)
     print("✅ Tables created successfully!")
+
+    print("Creating full-text search index...")
+    install_search_index(engine)
+    print("✅ Search index created successfully!")
     
     
 
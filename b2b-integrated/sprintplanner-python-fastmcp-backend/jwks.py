@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional
+
+import httpx
+import jwt
+
+from auth_executor import auth_executor
+from token_cache import VerifiedTokenCache
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSCache:
+    """In-memory cache of a JWKS document keyed by `kid`.
+
+    Keys are refetched once the TTL expires, refreshed in the background shortly
+    before that, and refetched early when a token references an unknown `kid`
+    (the signing key may have rotated since the last fetch).
+    """
+
+    def __init__(
+        self,
+        jwks_uri: str,
+        ttl_seconds: float = 300.0,
+        refresh_ahead_seconds: float = 60.0,
+        min_refetch_interval_seconds: float = 10.0,
+        timeout_seconds: float = 5.0,
+    ):
+        self.jwks_uri = jwks_uri
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.min_refetch_interval_seconds = min_refetch_interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at = 0.0
+        self._attempted_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def get_key(self, kid: str) -> Optional[Any]:
+        age = time.monotonic() - self._fetched_at
+        if not self._keys or age >= self.ttl_seconds:
+            await self._try_refresh()
+        elif age >= self.ttl_seconds - self.refresh_ahead_seconds:
+            self._schedule_refresh()
+
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._attempted_at >= self.min_refetch_interval_seconds:
+            await self._try_refresh()
+            key = self._keys.get(kid)
+        return key
+
+    async def refresh(self) -> None:
+        requested_at = time.monotonic()
+        async with self._lock:
+            # Another caller may have refreshed while we were waiting on the lock
+            if self._attempted_at >= requested_at:
+                return
+            self._attempted_at = time.monotonic()
+            async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
+                resp = await client.get(self.jwks_uri)
+                resp.raise_for_status()
+                jwks = resp.json()
+
+            keys = {}
+            for jwk in jwks.get("keys", []):
+                if jwk.get("kid"):
+                    keys[jwk["kid"]] = jwt.PyJWK(jwk).key
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+
+    async def _try_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            # Keep serving the stale keys (if any); callers fall back to the Stytch API
+            logger.warning("Failed to refresh JWKS from %s: %s", self.jwks_uri, e)
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._try_refresh())
+
+
+class SessionJWTVerifier:
+    """Verifies Stytch session JWTs locally against the project's cached JWKS.
+
+    `verify` returns the token's claims when it can be trusted locally, returns
+    None when the caller should defer to the Stytch API (unknown key, expired or
+    close to expiry), and raises `jwt.InvalidTokenError` for tokens that are
+    definitely invalid. Signatures are checked on the auth executor, and the
+    claims of a verified JWT are remembered until it gets close to expiry, so a
+    session presenting the same JWT again skips the signature check.
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        jwks_uri: str,
+        issuers: Iterable[str],
+        expiry_margin_seconds: float = 30.0,
+        jwks: Optional[JWKSCache] = None,
+        cache_size: int = 1024,
+    ):
+        self.project_id = project_id
+        self.issuers = set(issuers)
+        self.expiry_margin_seconds = expiry_margin_seconds
+        self.jwks = jwks or JWKSCache(jwks_uri)
+        # Bounded by the JWT's own lifetime; the TTL is only a backstop
+        self.cache = VerifiedTokenCache(maxsize=cache_size, ttl_seconds=3600.0)
+
+    async def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        cached = self.cache.get(token)
+        if cached is not None:
+            return cached
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        if not kid:
+            return None
+
+        key = await self.jwks.get_key(kid)
+        if key is None:
+            return None
+
+        try:
+            claims = await auth_executor.run(
+                jwt.decode,
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.project_id,
+                options={"verify_iss": False, "require": ["exp", "sub"]},
+            )
+        except jwt.ExpiredSignatureError:
+            # The JWT is short-lived but the underlying session may still be active
+            return None
+
+        if claims.get("iss") not in self.issuers:
+            raise jwt.InvalidIssuerError("Invalid issuer")
+        if claims["exp"] - time.time() < self.expiry_margin_seconds:
+            return None
+        self.cache.put(token, claims, claims["exp"] - self.expiry_margin_seconds)
+        return claims
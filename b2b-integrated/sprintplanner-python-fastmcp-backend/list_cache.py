@@ -0,0 +1,150 @@
+"""
+Read-through cache for per-tenant list reads.
+
+Entries are stored under (tenant, view) together with the tenant's write version
+(the counter bumped by every write in the same transaction). A reader looks the
+version up in the database first and only accepts an entry stored under that exact
+version, so a stale entry is never served, even when several workers share a cache
+or each keeps its own. Writes also invalidate the tenant's entries on commit so
+the local memory is released promptly.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+class CacheBackend:
+    """Storage for cached views; values must be JSON-serializable"""
+
+    def get(self, tenant: str, view: str) -> Optional[Tuple[int, Any]]:
+        raise NotImplementedError
+
+    def set(self, tenant: str, view: str, version: int, value: Any) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, tenant: str) -> None:
+        raise NotImplementedError
+
+class InMemoryCacheBackend(CacheBackend):
+    """Bounded, thread-safe LRU over (tenant, view) entries in this process"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, Any]]" = OrderedDict()
+        self._views: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tenant: str, view: str) -> Optional[Tuple[int, Any]]:
+        with self._lock:
+            entry = self._entries.get((tenant, view))
+            if entry is not None:
+                self._entries.move_to_end((tenant, view))
+            return entry
+
+    def set(self, tenant: str, view: str, version: int, value: Any) -> None:
+        with self._lock:
+            self._entries[(tenant, view)] = (version, value)
+            self._entries.move_to_end((tenant, view))
+            self._views.setdefault(tenant, set()).add(view)
+            while len(self._entries) > self.maxsize:
+                (old_tenant, old_view), _ = self._entries.popitem(last=False)
+                self._discard_view(old_tenant, old_view)
+
+    def invalidate(self, tenant: str) -> None:
+        with self._lock:
+            for view in self._views.pop(tenant, ()):
+                self._entries.pop((tenant, view), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard_view(self, tenant: str, view: str) -> None:
+        views = self._views.get(tenant)
+        if views is not None:
+            views.discard(view)
+            if not views:
+                del self._views[tenant]
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared by every worker, stored in Redis (or anything speaking its protocol).
+
+    Each view is a JSON `[version, value]` string with a TTL; a per-tenant set
+    tracks the tenant's view keys for invalidation.
+    """
+
+    def __init__(self, client: Any, prefix: str = "list-cache:", ttl_seconds: int = 300):
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, tenant: str, view: Optional[str] = None) -> str:
+        return f"{self.prefix}{tenant}" if view is None else f"{self.prefix}{tenant}:{view}"
+
+    def get(self, tenant: str, view: str) -> Optional[Tuple[int, Any]]:
+        raw = self.client.get(self._key(tenant, view))
+        if raw is None:
+            return None
+        version, value = json.loads(raw)
+        return version, value
+
+    def set(self, tenant: str, view: str, version: int, value: Any) -> None:
+        pipe = self.client.pipeline()
+        pipe.set(self._key(tenant, view), json.dumps([version, value], separators=(",", ":")), ex=self.ttl_seconds)
+        pipe.sadd(self._key(tenant), view)
+        pipe.expire(self._key(tenant), self.ttl_seconds)
+        pipe.execute()
+
+    def invalidate(self, tenant: str) -> None:
+        views = self.client.smembers(self._key(tenant))
+        keys = [self._key(tenant, view.decode() if isinstance(view, bytes) else view) for view in views]
+        self.client.delete(self._key(tenant), *keys)
+
+class ListCache:
+    """Version-checked read-through cache with hit-rate counters"""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tenant: str, view: str, version: int) -> Optional[Any]:
+        """Return the cached value if it was stored under `version`, else None"""
+        entry = self.backend.get(tenant, view)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, tenant: str, view: str, version: int, value: Any) -> None:
+        self.backend.set(tenant, view, version, value)
+
+    def invalidate(self, tenant: str) -> None:
+        self.backend.invalidate(tenant)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+        if isinstance(self.backend, InMemoryCacheBackend):
+            stats["size"] = len(self.backend)
+        return stats
+
+def backend_from_env() -> CacheBackend:
+    """Use Redis when LIST_CACHE_REDIS_URL is set (requires the `redis` package), else memory"""
+    redis_url = os.getenv("LIST_CACHE_REDIS_URL")
+    if redis_url:
+        import redis
+
+        return RedisCacheBackend(
+            redis.Redis.from_url(redis_url),
+            ttl_seconds=int(os.getenv("LIST_CACHE_TTL_SECONDS", "300")),
+        )
+    return InMemoryCacheBackend(maxsize=int(os.getenv("LIST_CACHE_MAX_ENTRIES", "1024")))
+
+cache = ListCache(backend_from_env())
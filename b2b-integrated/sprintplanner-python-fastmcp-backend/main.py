@@ -1,20 +1,42 @@
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from pydantic import ValidationError
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from contextlib import asynccontextmanager
+import functools
 import os
 import crud
-import models
+import etags
+import events
+import list_cache
+import ndjson
+import pagination
 import schemas
-from database import engine
-from mcp_server import mcp  
+from database import run_db, unit_of_work
+from auth_executor import auth_executor
+from write_queue import write_queue
+from init_db import init_db
+from mcp_server import STATELESS_HTTP, auth as mcp_auth, mcp
 from stytch_client import stytch_client
 
-# SETUP steps
-models.Base.metadata.create_all(bind=engine)
+# Schema setup runs at startup unless SKIP_SCHEMA_SETUP is set: the multi-worker
+# launcher sets it after creating the schema once, and deployments whose schema is
+# managed by Alembic can set it themselves
+SKIP_SCHEMA_SETUP = os.getenv("SKIP_SCHEMA_SETUP", "false").lower() in ("1", "true", "yes")
+
 # Build MCP ASGI app first to wire lifespan
-mcp_app = mcp.http_app(path="/")
-# Pass MCP lifespan into FastAPI so StreamableHTTP session manager is initialized
-app = FastAPI(title="Ticket Board API", version="1.0.0", lifespan=mcp_app.lifespan)
+mcp_app = mcp.http_app(path="/", stateless_http=STATELESS_HTTP)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not SKIP_SCHEMA_SETUP:
+        init_db()
+    # Run the MCP lifespan so the StreamableHTTP session manager is initialized
+    async with mcp_app.lifespan(app):
+        yield
+
+app = FastAPI(title="Ticket Board API", version="1.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS middleware for frontend integration
 app.add_middleware(
@@ -42,24 +64,85 @@ async def verify_stytch_session(request: Request):
 
     return session
 
+async def write_unit_of_work() -> AsyncIterator[None]:
+    """Run a write request (org check, write and relist) in one session and transaction.
+
+    With group commit on (WRITE_QUEUE_MAX_BATCH > 1) the write queue owns the
+    transaction instead, so the write can share a commit with other requests.
+    """
+    if write_queue.enabled:
+        yield
+        return
+    async with unit_of_work():
+        yield
+
+def ticket_list_response(tickets: List[Dict[str, Any]], headers: Optional[Dict[str, str]] = None) -> ORJSONResponse:
+    """Tickets from crud are already JSON-ready; encode them without re-validating each one"""
+    return ORJSONResponse({"tickets": tickets}, headers=headers)
+
+def wants_delta(request: Request) -> bool:
+    """Clients opt into delta responses with `?return=delta` or `Prefer: return=minimal`"""
+    if request.query_params.get("return") == "delta":
+        return True
+    return "return=minimal" in request.headers.get("prefer", "")
+
 @app.get("/")
 async def root():
     return {"message": "Ticket Board API"}
 
+@app.get("/api/metrics")
+async def metrics():
+    """Counters of this worker's caches and queues, for dashboards and tuning"""
+    return {
+        "mcp_token_cache": mcp_auth.token_cache.stats(),
+        "session_jwt_cache": stytch_client.verifier.cache.stats(),
+        "auth_executor": auth_executor.stats(),
+        "write_queue": write_queue.stats(),
+        "list_cache": list_cache.cache.stats(),
+    }
+
 @app.get("/api/tickets", response_model=schemas.TicketListResponse)
 async def get_tickets(
+    request: Request,
     session: dict = Depends(verify_stytch_session)
 ):
-    """Get all tickets for the organization"""
+    """Get all tickets for the organization.
+
+    The response carries an ETag of the board version; send it back in
+    If-None-Match to get `304 Not Modified` while the board is unchanged.
+    """
     org_id = session["organization_id"]
     
     # Ensure organization exists
-    crud.get_or_create_organization(org_id)
+    await run_db(crud.ensure_organization, org_id)
+    
+    # Read the version before the list: the list can only be newer than its ETag, never staler
+    etag = etags.make_etag(org_id, await run_db(crud.get_board_version, org_id))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etags.if_none_match(request, etag):
+        return Response(status_code=304, headers=headers)
     
-    tickets = crud.get_tickets(org_id)
-    return schemas.TicketListResponse(tickets=tickets)
+    tickets = await run_db(crud.get_tickets, org_id)
+    return ticket_list_response(tickets, headers=headers)
+
+@app.get("/api/tickets/search", response_model=schemas.TicketListResponse)
+async def search_tickets(
+    q: str,
+    status: Optional[str] = None,
+    assignee: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    session: dict = Depends(verify_stytch_session)
+):
+    """Full-text search over ticket titles and descriptions, best match first"""
+    org_id = session["organization_id"]
+    tickets = await run_db(crud.full_text_search_tickets, org_id, q, status=status, assignee=assignee, limit=limit)
+    return ticket_list_response([pagination.project_row(t, pagination.TICKET_RESPONSE_FIELDS) for t in tickets])
 
-@app.post("/api/tickets", response_model=schemas.TicketListResponse)
+@app.post(
+    "/api/tickets",
+    response_model=Union[schemas.TicketListResponse, schemas.TicketChange],
+    dependencies=[Depends(write_unit_of_work)],
+)
 async def create_ticket(
     request: Request,
     session: dict = Depends(verify_stytch_session)
@@ -84,18 +167,93 @@ async def create_ticket(
     org_id = session["organization_id"]
     
     # Ensure organization exists
-    organization = crud.get_or_create_organization(org_id)
+    await run_db(crud.ensure_organization, org_id)
     
-    # Create the ticket
-    new_ticket = crud.create_ticket(ticket_data, org_id)
+    # Create the ticket (through the write queue, see write_queue.py)
+    new_ticket, version = await write_queue.submit(crud.with_board_version, org_id, crud.create_ticket, ticket_data, org_id)
+    if wants_delta(request):
+        return schemas.TicketChange(ticket=new_ticket, version=version)
     
     # Return all tickets for the organization
-    tickets = crud.get_tickets(org_id)
+    tickets = await run_db(crud.get_tickets, org_id)
     
-    response = schemas.TicketListResponse(tickets=tickets)
-    return response
+    return ticket_list_response(tickets)
+
+# Tickets are inserted (and committed) in chunks as the request body streams in
+IMPORT_CHUNK_SIZE = 500
+IMPORT_MAX_ERRORS = 100
 
-@app.post("/api/tickets/{ticket_id}/status", response_model=schemas.TicketListResponse)
+@app.post("/api/tickets:bulk", response_model=schemas.TicketImportResult)
+async def import_tickets(
+    request: Request,
+    session: dict = Depends(verify_stytch_session)
+):
+    """Bulk-create tickets from an NDJSON body, one ticket object per line.
+
+    Valid lines are inserted in chunks as the body is read; invalid lines are
+    skipped and reported by line number. A line longer than `ndjson.MAX_LINE_BYTES`
+    stops the import with a 413 whose body still reports `created`, `failed` and
+    `errors`: tickets from the lines before it are kept.
+    """
+    org_id = session["organization_id"]
+    await run_db(crud.ensure_organization, org_id)
+
+    created, failed, errors, chunk = 0, 0, [], []
+    try:
+        async for line_number, line in ndjson.iter_lines(request.stream()):
+            try:
+                ticket = schemas.TicketImport.model_validate_json(line)
+                if ticket.status not in schemas.TICKET_STATUSES:
+                    raise ValueError("Invalid status")
+            except (ValidationError, ValueError) as e:
+                failed += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append(schemas.TicketImportError(line=line_number, error=str(e)))
+                continue
+            chunk.append(ticket)
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                created += await run_db(crud.import_tickets, chunk, org_id)
+                chunk = []
+    except ndjson.LineTooLongError as e:
+        # Earlier chunks are already committed, so report them rather than fail the whole import
+        created += await run_db(crud.import_tickets, chunk, org_id)
+        result = schemas.TicketImportResult(created=created, failed=failed, errors=errors)
+        return JSONResponse(status_code=413, content={**result.model_dump(), "detail": str(e)})
+    created += await run_db(crud.import_tickets, chunk, org_id)
+
+    return schemas.TicketImportResult(created=created, failed=failed, errors=errors)
+
+@app.get("/api/tickets/export")
+async def export_tickets(
+    session: dict = Depends(verify_stytch_session)
+):
+    """Stream every ticket of the organization as NDJSON, oldest first"""
+    org_id = session["organization_id"]
+    fields = list(pagination.TICKET_FIELDS)
+    return StreamingResponse(
+        ndjson.stream_batches(crud.iter_ticket_batches(org_id), lambda row: pagination.project_row(row, fields)),
+        media_type=ndjson.NDJSON_MEDIA_TYPE,
+    )
+
+@app.get("/api/tickets/stream")
+async def stream_ticket_changes(
+    request: Request,
+    session: dict = Depends(verify_stytch_session)
+):
+    """Server-Sent Events feed of the organization's ticket changes (resumable with Last-Event-ID)"""
+    org_id = session["organization_id"]
+    get_version = functools.partial(run_db, crud.get_board_version, org_id)
+    return StreamingResponse(
+        events.change_stream(events.broker, org_id, get_version, request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post(
+    "/api/tickets/{ticket_id}/status",
+    response_model=Union[schemas.TicketListResponse, schemas.TicketChange],
+    dependencies=[Depends(write_unit_of_work)],
+)
 async def update_ticket_status(
     ticket_id: str,
     request: Request,
@@ -121,35 +279,45 @@ async def update_ticket_status(
         raise HTTPException(status_code=422, detail=str(e))
     
     # Validate status
-    valid_statuses = ["backlog", "in-progress", "review", "done"]
-    if status_data.status not in valid_statuses:
+    if status_data.status not in schemas.TICKET_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status")
     
     # Update the ticket
-    ticket = crud.update_ticket_status(ticket_id, status_data.status, org_id)
+    ticket, version = await write_queue.submit(
+        crud.with_board_version, org_id, crud.update_ticket_status, ticket_id, status_data.status, org_id
+    )
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
+    if wants_delta(request):
+        return schemas.TicketChange(ticket=ticket, version=version)
     
     # Return all tickets for the organization
-    tickets = crud.get_tickets(org_id)
-    return schemas.TicketListResponse(tickets=tickets)
+    tickets = await run_db(crud.get_tickets, org_id)
+    return ticket_list_response(tickets)
 
-@app.delete("/api/tickets/{ticket_id}", response_model=schemas.TicketListResponse)
+@app.delete(
+    "/api/tickets/{ticket_id}",
+    response_model=Union[schemas.TicketListResponse, schemas.TicketChange],
+    dependencies=[Depends(write_unit_of_work)],
+)
 async def delete_ticket(
     ticket_id: str,
+    request: Request,
     session: dict = Depends(verify_stytch_session)
 ):
     """Delete a ticket"""
     org_id = session["organization_id"]
     
     # Delete the ticket
-    success = crud.delete_ticket(ticket_id, org_id)
+    success, version = await write_queue.submit(crud.with_board_version, org_id, crud.delete_ticket, ticket_id, org_id)
     if not success:
         raise HTTPException(status_code=404, detail="Ticket not found")
+    if wants_delta(request):
+        return schemas.TicketChange(deleted_id=ticket_id, version=version)
     
     # Return all tickets for the organization
-    tickets = crud.get_tickets(org_id)
-    return schemas.TicketListResponse(tickets=tickets)
+    tickets = await run_db(crud.get_tickets, org_id)
+    return ticket_list_response(tickets)
 
 @app.get("/.well-known/oauth-protected-resource")
 async def oauth_metadata(request: Request) -> JSONResponse:
@@ -191,5 +359,6 @@ def oauth_authorization_server(request: Request):
     }
 
 if __name__ == "__main__":
+    # Single process for local development; see serve.py for the multi-worker launcher
     import uvicorn
     uvicorn.run(app, host="127.0.0.1", port=3001)
@@ -4,17 +4,30 @@ Standalone MCP Server for the Ticket Board application
 
 from dotenv import load_dotenv
 from fastmcp import FastMCP
-from fastmcp.server.auth import BearerAuthProvider
+from fastmcp.exceptions import ToolError
 from fastmcp.server.dependencies import get_access_token
 from typing import List, Dict, Any, Optional
 import crud
+import events
+import pagination
 import schemas
 import os
+from database import run_db, unit_of_work
+from write_queue import write_queue
+from token_cache import CachingBearerAuthProvider
 
 
 load_dotenv(".env.local")
 
-auth = BearerAuthProvider(
+# Upper bound on the number of items a single batch tool call may carry
+MAX_BATCH_SIZE = int(os.getenv("MCP_MAX_BATCH_SIZE", "100"))
+# Stateless transport: every MCP request stands alone (no Mcp-Session-Id), so
+# requests can land on any worker or node. Resource subscriptions need a
+# session and are not offered in this mode.
+STATELESS_HTTP = os.getenv("MCP_STATELESS_HTTP", "false").lower() in ("1", "true", "yes")
+
+# Verified tokens are cached so repeat tool calls skip RS256 verification
+auth = CachingBearerAuthProvider(
     jwks_uri=f"{os.getenv('STYTCH_DOMAIN')}/.well-known/jwks.json",
     issuer=os.getenv("STYTCH_DOMAIN"),
     algorithm="RS256",
@@ -34,40 +47,53 @@ def get_organization_id_from_context() -> str:
 
     return token.claims.get("https://stytch.com/organization", {}).get("organization_id")
 
+# Subscribed sessions get `resources/updated` for their tickets:// URIs after every ticket write
+resource_subscriptions = events.ResourceSubscriptions(events.broker)
+if not STATELESS_HTTP:
+    resource_subscriptions.install(mcp, get_organization_id_from_context)
+
+def check_batch_size(items: List[Any]) -> None:
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} items can be sent in one batch")
+
+async def get_ticket_page(
+    organization_id: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    **filters: Optional[str],
+) -> Dict[str, Any]:
+    """Fetch one page of tickets as `{"tickets": [...], "next_cursor": ..., "version": ...}`"""
+    return await run_db(
+        crud.get_tickets_page,
+        organization_id,
+        pagination.clamp_page_size(limit),
+        after=pagination.decode_cursor(cursor) if cursor else None,
+        fields=pagination.resolve_fields(fields),
+        **filters,
+    )
+
 @mcp.tool()
-async def list_tickets() -> List[Dict[str, Any]]:
-    """List all tickets for the authenticated organization"""
+async def list_tickets(
+    cursor: Optional[str] = None,
+    limit: int = pagination.DEFAULT_PAGE_SIZE,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """List tickets for the authenticated organization, one page at a time.
+
+    Returns `{"tickets": [...], "next_cursor": ..., "version": ...}` rather than a bare list.
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page, and
+    `fields` (e.g. ["id", "title", "status"]) to limit which ticket fields are returned.
+    """
     organization_id = get_organization_id_from_context()
-    tickets = crud.get_tickets(organization_id)
-    return [
-        {
-            "id": ticket.id,
-            "title": ticket.title,
-            "assignee": ticket.assignee,
-            "status": ticket.status,
-            "description": ticket.description,
-            "created_at": ticket.created_at.isoformat(),
-            "updated_at": ticket.updated_at.isoformat()
-        }
-        for ticket in tickets
-    ]
+    return await get_ticket_page(organization_id, cursor=cursor, limit=limit, fields=fields)
 
 @mcp.tool()
 async def get_ticket(ticket_id: str) -> Optional[Dict[str, Any]]:
     """Get a specific ticket by ID for the authenticated organization"""
     organization_id = get_organization_id_from_context()
-    ticket = crud.get_ticket(ticket_id, organization_id)
-    if ticket:
-        return {
-            "id": ticket.id,
-            "title": ticket.title,
-            "assignee": ticket.assignee,
-            "status": ticket.status,
-            "description": ticket.description,
-            "created_at": ticket.created_at.isoformat(),
-            "updated_at": ticket.updated_at.isoformat()
-        }
-    return None
+    ticket = await run_db(crud.get_ticket, ticket_id, organization_id)
+    return pagination.project_row(ticket) if ticket else None
 
 @mcp.tool()
 async def create_ticket(
@@ -78,9 +104,6 @@ async def create_ticket(
     """Create a new ticket for the authenticated organization"""
     organization_id = get_organization_id_from_context()
     
-    # Ensure organization exists
-    crud.get_or_create_organization(organization_id)
-    
     # Create ticket data
     ticket_data = schemas.TicketCreate(
         title=title,
@@ -88,18 +111,11 @@ async def create_ticket(
         description=description
     )
     
-    # Create the ticket
-    ticket = crud.create_ticket(ticket_data, organization_id)
+    # Ensure organization exists (a no-op once known), then queue the insert for group commit
+    await run_db(crud.ensure_organization, organization_id)
+    ticket = await write_queue.submit(crud.create_ticket, ticket_data, organization_id)
     
-    return {
-        "id": ticket.id,
-        "title": ticket.title,
-        "assignee": ticket.assignee,
-        "status": ticket.status,
-        "description": ticket.description,
-        "created_at": ticket.created_at.isoformat(),
-        "updated_at": ticket.updated_at.isoformat()
-    }
+    return pagination.project_row(ticket)
 
 @mcp.tool()
 async def update_ticket_status(
@@ -108,31 +124,69 @@ async def update_ticket_status(
 ) -> Optional[Dict[str, Any]]:
     """Update the status of a ticket"""
     organization_id = get_organization_id_from_context()
-    ticket = crud.update_ticket_status(ticket_id, status, organization_id)
-    if ticket:
-        return {
-            "id": ticket.id,
-            "title": ticket.title,
-            "assignee": ticket.assignee,
-            "status": ticket.status,
-            "description": ticket.description,
-            "created_at": ticket.created_at.isoformat(),
-            "updated_at": ticket.updated_at.isoformat()
-        }
-    return None
+    ticket = await write_queue.submit(crud.update_ticket_status, ticket_id, status, organization_id)
+    return pagination.project_row(ticket) if ticket else None
 
 @mcp.tool()
 async def delete_ticket(ticket_id: str) -> bool:
     """Delete a ticket from the authenticated organization"""
     organization_id = get_organization_id_from_context()
-    return crud.delete_ticket(ticket_id, organization_id)
+    return await write_queue.submit(crud.delete_ticket, ticket_id, organization_id)
+
+
+
+@mcp.tool()
+async def create_tickets(tickets: List[schemas.TicketCreate]) -> Dict[str, Any]:
+    """Create several tickets for the authenticated organization in one transaction.
+
+    Returns one result per input ticket, in order.
+    """
+    check_batch_size(tickets)
+    organization_id = get_organization_id_from_context()
+    async with unit_of_work():
+        await run_db(crud.ensure_organization, organization_id)
+        created = await run_db(crud.create_tickets, tickets, organization_id)
+    return {"results": [{"ticket_id": ticket.id, "ok": True, "ticket": pagination.project_row(ticket)} for ticket in created]}
 
+@mcp.tool()
+async def update_ticket_statuses(updates: List[schemas.TicketStatusChange]) -> Dict[str, Any]:
+    """Update the status of several tickets in one transaction.
+
+    Returns one result per update, in order; unknown tickets and invalid statuses are reported per item.
+    """
+    check_batch_size(updates)
+    organization_id = get_organization_id_from_context()
+    valid = [(u.ticket_id, u.status) for u in updates if u.status in schemas.TICKET_STATUSES]
+    updated = await run_db(crud.update_ticket_statuses, valid, organization_id) if valid else {}
+
+    results = []
+    for u in updates:
+        if u.status not in schemas.TICKET_STATUSES:
+            results.append({"ticket_id": u.ticket_id, "ok": False, "error": "Invalid status"})
+        elif u.ticket_id not in updated:
+            results.append({"ticket_id": u.ticket_id, "ok": False, "error": "Ticket not found"})
+        else:
+            results.append({"ticket_id": u.ticket_id, "ok": True, "ticket": pagination.project_row(updated[u.ticket_id])})
+    return {"results": results}
 
+@mcp.tool()
+async def delete_tickets(ticket_ids: List[str]) -> Dict[str, Any]:
+    """Delete several tickets from the authenticated organization in one transaction"""
+    check_batch_size(ticket_ids)
+    organization_id = get_organization_id_from_context()
+    deleted = set(await run_db(crud.delete_tickets, ticket_ids, organization_id))
+    return {
+        "results": [
+            {"ticket_id": ticket_id, "ok": True} if ticket_id in deleted
+            else {"ticket_id": ticket_id, "ok": False, "error": "Ticket not found"}
+            for ticket_id in ticket_ids
+        ]
+    }
 
 @mcp.tool()
 async def get_organization(organization_id: str) -> Optional[Dict[str, Any]]:
     """Get a specific organization by ID"""
-    org = crud.get_organization(organization_id)
+    org = await run_db(crud.get_organization, organization_id)
     info = org.name if org else None
     return info
 
@@ -140,68 +194,56 @@ async def get_organization(organization_id: str) -> Optional[Dict[str, Any]]:
 async def search_tickets(
     status: Optional[str] = None,
     assignee: Optional[str] = None,
-    title_contains: Optional[str] = None
-) -> List[Dict[str, Any]]:
-    """Search tickets with filters for the authenticated organization"""
+    title_contains: Optional[str] = None,
+    query: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = pagination.DEFAULT_PAGE_SIZE,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Search tickets with filters for the authenticated organization, one page at a time.
+
+    `query` runs a full-text search over titles and descriptions and returns the best
+    `limit` matches ranked by relevance (ranked results are not paginated, and
+    `query` cannot be combined with `title_contains` or `cursor`).
+    """
+    if query and (title_contains or cursor):
+        raise ToolError("`query` cannot be combined with `title_contains` or `cursor`")
     organization_id = get_organization_id_from_context()
-    tickets = crud.search_tickets(
+    if query:
+        columns = pagination.resolve_fields(fields)
+        tickets = await run_db(
+            crud.full_text_search_tickets,
+            organization_id,
+            query,
+            status=status,
+            assignee=assignee,
+            limit=pagination.clamp_page_size(limit),
+        )
+        return {"tickets": [pagination.project_row(t, columns) for t in tickets], "next_cursor": None}
+    return await get_ticket_page(
         organization_id,
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
         status=status,
         assignee=assignee,
         title_contains=title_contains,
     )
-    
-    return [
-        {
-            "id": ticket.id,
-            "title": ticket.title,
-            "assignee": ticket.assignee,
-            "status": ticket.status,
-            "description": ticket.description,
-            "created_at": ticket.created_at.isoformat(),
-            "updated_at": ticket.updated_at.isoformat()
-        }
-        for ticket in tickets
-    ]
 
 @mcp.tool()
 async def get_ticket_statistics() -> Dict[str, Any]:
     """Get statistics about tickets for the authenticated organization"""
     organization_id = get_organization_id_from_context()
-    tickets = crud.get_tickets(organization_id)
-    
-    total_tickets = len(tickets)
-    status_counts = {}
-    assignee_counts = {}
-    
-    for ticket in tickets:
-        # Count by status
-        status_counts[ticket.status] = status_counts.get(ticket.status, 0) + 1
-        
-        # Count by assignee
-        assignee_counts[ticket.assignee] = assignee_counts.get(ticket.assignee, 0) + 1
-    
-    return {
-        "total_tickets": total_tickets,
-        "status_distribution": status_counts,
-        "assignee_distribution": assignee_counts,
-        "organization_id": organization_id
-    }
+    statistics = await run_db(crud.get_ticket_statistics, organization_id)
+    return {**statistics, "organization_id": organization_id}
 
 
 @mcp.resource("tickets://authenticated", mime_type="application/json")
-async def tickets_resource() -> List[Dict[str, Any]]:
+async def tickets_resource() -> Dict[str, Any]:
+    organization_id = get_organization_id_from_context()
+    return await get_ticket_page(organization_id)
+
+@mcp.resource("tickets://authenticated/{cursor}", mime_type="application/json")
+async def tickets_page_resource(cursor: str) -> Dict[str, Any]:
     organization_id = get_organization_id_from_context()
-    tickets = crud.get_tickets(organization_id)
-    return [
-        {
-            "id": t.id,
-            "title": t.title,
-            "assignee": t.assignee,
-            "status": t.status,
-            "description": t.description,
-            "created_at": t.created_at.isoformat() if t.created_at else None,
-            "updated_at": t.updated_at.isoformat() if t.updated_at else None,
-        }
-        for t in tickets
-    ]
+    return await get_ticket_page(organization_id, cursor=cursor)
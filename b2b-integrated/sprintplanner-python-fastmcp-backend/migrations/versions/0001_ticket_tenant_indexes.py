@@ -0,0 +1,42 @@
+"""Add tenant-scoped indexes to tickets
+
+Every ticket query filters by organization_id, and search_tickets also filters
+by status and lower(assignee). Tables themselves are created by init_db.py /
+create_all, which also creates these indexes on fresh databases; this revision
+adds them to databases created before the indexes existed.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tickets_org_created_at", "tickets", ["organization_id", "created_at", "id"], if_not_exists=True
+    )
+    op.create_index("ix_tickets_org_status", "tickets", ["organization_id", "status"], if_not_exists=True)
+    op.create_index(
+        "ix_tickets_org_lower_assignee",
+        "tickets",
+        ["organization_id", sa.text("lower(assignee)")],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tickets_org_lower_assignee", table_name="tickets")
+    op.drop_index("ix_tickets_org_status", table_name="tickets")
+    op.drop_index("ix_tickets_org_created_at", table_name="tickets")
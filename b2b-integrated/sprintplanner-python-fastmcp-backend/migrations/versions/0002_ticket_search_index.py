@@ -0,0 +1,75 @@
+"""Add the full-text search index over ticket titles and descriptions
+
+SQLite gets an FTS5 table kept in sync by triggers (backfilled from existing
+tickets); Postgres gets a GIN index over a tsvector expression.
+
+The DDL is frozen here as it shipped: the SQLite index of this revision is keyed
+by the tickets rowid, and 0003 rebuilds it on a stable docid.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POSTGRES_DOCUMENT_SQL = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+SQLITE_TRIGGERS = (
+    """
+    CREATE TRIGGER tickets_fts_ai AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tickets_fts_ad AFTER DELETE ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tickets_fts_au AFTER UPDATE OF title, description ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO tickets_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_tickets_search ON tickets USING GIN ({POSTGRES_DOCUMENT_SQL})")
+        return
+    if "tickets_fts" in sa.inspect(bind).get_table_names():
+        # Installed by init_db.py or the application
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE tickets_fts USING fts5("
+        "title, description, content='tickets', content_rowid='rowid')"
+    )
+    # Index any tickets written before the search table existed
+    op.execute("INSERT INTO tickets_fts(tickets_fts) VALUES ('rebuild')")
+    for trigger in SQLITE_TRIGGERS:
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_tickets_search")
+        return
+    for trigger in ("tickets_fts_ai", "tickets_fts_ad", "tickets_fts_au"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS tickets_fts")
+    op.execute("DROP TABLE IF EXISTS tickets_fts_docs")
@@ -0,0 +1,111 @@
+"""Key the SQLite full-text index by a stable docid instead of the tickets rowid
+
+tickets has a VARCHAR primary key, so its implicit rowid may change on VACUUM
+and leave the rowid-keyed FTS5 index pointing at the wrong tickets. The index is
+rebuilt as a contentless FTS5 table keyed by tickets_fts_docs.docid (an INTEGER
+PRIMARY KEY). Postgres is unaffected.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGER_NAMES = ("tickets_fts_ai", "tickets_fts_ad", "tickets_fts_au")
+
+DOCID_TRIGGERS = (
+    """
+    CREATE TRIGGER tickets_fts_ai AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts_docs(ticket_id) VALUES (new.id);
+        INSERT INTO tickets_fts(rowid, title, description)
+        VALUES ((SELECT docid FROM tickets_fts_docs WHERE ticket_id = new.id), new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tickets_fts_ad AFTER DELETE ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', (SELECT docid FROM tickets_fts_docs WHERE ticket_id = old.id), old.title, old.description);
+        DELETE FROM tickets_fts_docs WHERE ticket_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER tickets_fts_au AFTER UPDATE OF title, description ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', (SELECT docid FROM tickets_fts_docs WHERE ticket_id = old.id), old.title, old.description);
+        INSERT INTO tickets_fts(rowid, title, description)
+        VALUES ((SELECT docid FROM tickets_fts_docs WHERE ticket_id = new.id), new.title, new.description);
+    END
+    """,
+)
+
+# The rowid-keyed layout of 0002, restored on downgrade
+ROWID_TRIGGERS = (
+    """
+    CREATE TRIGGER tickets_fts_ai AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tickets_fts_ad AFTER DELETE ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tickets_fts_au AFTER UPDATE OF title, description ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO tickets_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+)
+
+
+def _drop_index() -> None:
+    for trigger in TRIGGER_NAMES:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS tickets_fts")
+    op.execute("DROP TABLE IF EXISTS tickets_fts_docs")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    if "tickets_fts_docs" in sa.inspect(bind).get_table_names():
+        # Already keyed by docid (installed by init_db.py or the application)
+        return
+    _drop_index()
+    op.execute("CREATE TABLE tickets_fts_docs (docid INTEGER PRIMARY KEY, ticket_id VARCHAR NOT NULL UNIQUE)")
+    op.execute("CREATE VIRTUAL TABLE tickets_fts USING fts5(title, description, content='')")
+    op.execute("INSERT INTO tickets_fts_docs(ticket_id) SELECT id FROM tickets")
+    op.execute(
+        "INSERT INTO tickets_fts(rowid, title, description) "
+        "SELECT d.docid, t.title, t.description FROM tickets t JOIN tickets_fts_docs d ON d.ticket_id = t.id"
+    )
+    for trigger in DOCID_TRIGGERS:
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _drop_index()
+    op.execute(
+        "CREATE VIRTUAL TABLE tickets_fts USING fts5("
+        "title, description, content='tickets', content_rowid='rowid')"
+    )
+    op.execute("INSERT INTO tickets_fts(tickets_fts) VALUES ('rebuild')")
+    for trigger in ROWID_TRIGGERS:
+        op.execute(trigger)
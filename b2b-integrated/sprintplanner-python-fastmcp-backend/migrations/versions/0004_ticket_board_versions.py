@@ -0,0 +1,35 @@
+"""Add the per-organization ticket board version counter
+
+crud bumps ticket_board_versions in the same transaction as every ticket write;
+list ETags, the list cache and the change feed all read it. init_db.py creates
+the table on fresh databases; this revision adds it to existing ones.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ticket_board_versions",
+        sa.Column("organization_id", sa.String(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ticket_board_versions")
@@ -1,13 +1,18 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
-import uuid
+from ids import generate_id
+
+# SQLite's CURRENT_TIMESTAMP has second resolution; bind datetimes in the same format
+# so keyset comparisons against server-generated timestamps line up with stored text
+Timestamp = DateTime(timezone=True).with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite")
 
 class Organization(Base):
     __tablename__ = "organizations"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     name = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -15,20 +20,39 @@ class Organization(Base):
     # Relationship to tickets
     tickets = relationship("Ticket", back_populates="organization", cascade="all, delete-orphan")
 
+    # Fetch server-generated timestamps with RETURNING at flush time
+    __mapper_args__ = {"eager_defaults": True}
+
 class Ticket(Base):
     __tablename__ = "tickets"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=generate_id)
     title = Column(String, nullable=False)
     assignee = Column(String, nullable=False)
     status = Column(String, nullable=False, default="backlog")
     description = Column(Text, nullable=True)
     organization_id = Column(String, ForeignKey("organizations.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
     
     # Relationship to organization
     organization = relationship("Organization", back_populates="tickets")
+
+    # Every query is scoped to one organization; keep these in sync with migrations/versions
+    __table_args__ = (
+        Index("ix_tickets_org_created_at", "organization_id", "created_at", "id"),
+        Index("ix_tickets_org_status", "organization_id", "status"),
+        Index("ix_tickets_org_lower_assignee", "organization_id", func.lower(assignee)),
+    )
+    # Fetch server-generated timestamps with RETURNING at flush time
+    __mapper_args__ = {"eager_defaults": True}
     
     def __repr__(self):
         return f"<Ticket(id={self.id}, title='{self.title}', status='{self.status}')>"
+
+class TicketBoardVersion(Base):
+    """Per-organization write counter, bumped in the same transaction as every ticket mutation"""
+    __tablename__ = "ticket_board_versions"
+
+    organization_id = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
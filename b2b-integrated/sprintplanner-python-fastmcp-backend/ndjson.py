@@ -0,0 +1,53 @@
+"""
+Streaming helpers for newline-delimited JSON (NDJSON) bulk import and export
+"""
+
+import json
+from typing import Any, AsyncIterator, Callable, Iterator, List, Tuple
+
+from database import run_db
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# A single record larger than this is rejected instead of being buffered
+MAX_LINE_BYTES = 1024 * 1024
+
+class LineTooLongError(ValueError):
+    """A line of the body is longer than MAX_LINE_BYTES; lines after it are not read"""
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a streamed request body into `(line_number, line)` pairs, skipping blank lines.
+
+    Only the current partial line is held in memory. Raises LineTooLongError for a line
+    longer than MAX_LINE_BYTES.
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if len(line) > MAX_LINE_BYTES:
+                raise LineTooLongError(f"Line {line_number} exceeds {MAX_LINE_BYTES} bytes")
+            if line.strip():
+                yield line_number, line
+        if len(buffer) > MAX_LINE_BYTES:
+            raise LineTooLongError(f"Line {line_number + 1} exceeds {MAX_LINE_BYTES} bytes")
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+async def stream_batches(batches: Iterator[List[Any]], encode: Callable[[Any], dict]) -> AsyncIterator[bytes]:
+    """Encode the batches of a blocking iterator as NDJSON, one batch per chunk.
+
+    Each batch is fetched on the DB executor, so the database cursor advances only
+    as fast as the client reads. The iterator is closed if the client disconnects.
+    """
+    try:
+        while True:
+            batch = await run_db(next, batches, None)
+            if batch is None:
+                return
+            yield "".join(json.dumps(encode(item), separators=(",", ":")) + "\n" for item in batch).encode()
+    finally:
+        await run_db(batches.close)
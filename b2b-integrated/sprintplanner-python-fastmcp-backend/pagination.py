@@ -0,0 +1,55 @@
+"""
+Helpers for keyset (cursor) pagination and field projection of ticket lists.
+
+`project_row` is the single ticket serializer: REST responses, MCP tools and
+resources all build their ticket dicts with it, straight from ORM objects or
+selected rows, without a pydantic round trip.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Fields an MCP client may request; `id` is always returned
+TICKET_FIELDS = ("id", "title", "assignee", "status", "description", "created_at", "updated_at")
+# Fields of a ticket in REST responses (schemas.TicketResponse)
+TICKET_RESPONSE_FIELDS = ("id", "title", "assignee", "status", "organization_id", "created_at", "updated_at")
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+def encode_cursor(created_at: datetime, ticket_id: str) -> str:
+    """Encode the sort key of the last ticket on a page as an opaque cursor"""
+    payload = json.dumps([created_at.isoformat(), ticket_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, ticket_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(ticket_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def resolve_fields(fields: Optional[Iterable[str]]) -> List[str]:
+    """Validate a requested projection, defaulting to every ticket field"""
+    if not fields:
+        return list(TICKET_FIELDS)
+    unknown = set(fields) - set(TICKET_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown ticket fields: {', '.join(sorted(unknown))}")
+    return ["id"] + [field for field in TICKET_FIELDS if field in fields and field != "id"]
+
+def project_row(row: Any, fields: Sequence[str] = TICKET_FIELDS) -> dict:
+    """Build a JSON-ready dict from a selected row or ticket, limited to the requested fields"""
+    result = {}
+    for field in fields:
+        value = getattr(row, field)
+        result[field] = value.isoformat() if isinstance(value, datetime) else value
+    return result
@@ -2,13 +2,18 @@ from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
+TICKET_STATUSES = ["backlog", "in-progress", "review", "done"]
+
 # Base schemas
 class TicketBase(BaseModel):
     title: str
     assignee: str
 
 class TicketCreate(TicketBase):
-    pass
+    description: Optional[str] = None
+
+class TicketImport(TicketCreate):
+    status: str = "backlog"
 
 class TicketUpdate(BaseModel):
     title: Optional[str] = None
@@ -19,6 +24,9 @@ class TicketUpdate(BaseModel):
 class TicketStatusUpdate(BaseModel):
     status: str
 
+class TicketStatusChange(TicketStatusUpdate):
+    ticket_id: str
+
 # Response schemas
 class TicketResponse(TicketBase):
     id: str
@@ -30,6 +38,22 @@ class TicketResponse(TicketBase):
     class Config:
         from_attributes = True
 
+class TicketChange(BaseModel):
+    """Result of a single mutation: the affected ticket plus the board's new version"""
+    ticket: Optional[TicketResponse] = None
+    deleted_id: Optional[str] = None
+    version: int
+
+class TicketImportError(BaseModel):
+    line: int
+    error: str
+
+class TicketImportResult(BaseModel):
+    """Summary of a bulk import; `errors` lists at most the first 100 rejected lines"""
+    created: int
+    failed: int
+    errors: List[TicketImportError]
+
 class OrganizationResponse(BaseModel):
     id: str
     name: str
@@ -0,0 +1,134 @@
+"""
+Full-text search over ticket titles and descriptions.
+
+SQLite uses a contentless FTS5 table kept in sync with `tickets` by triggers;
+Postgres uses a GIN index over a `tsvector` expression. Both backends
+produce the same ranked, organization-scoped query for crud.
+"""
+
+import re
+from typing import Optional
+
+from sqlalchemy import Select, column, func, literal_column, select, table, text
+from sqlalchemy.engine import Connection
+
+import models
+
+tickets_fts = table("tickets_fts", column("rowid"))
+tickets_fts_docs = table("tickets_fts_docs", column("docid"), column("ticket_id"))
+
+class TicketSearchBackend:
+    """Creates the search index and builds ranked ticket queries for one database dialect"""
+
+    def install(self, connection: Connection) -> None:
+        raise NotImplementedError
+
+    def query(self, org_id: str, search_text: str) -> Optional[Select]:
+        """Select matching tickets of an organization, best match first (None if nothing to search for)"""
+        raise NotImplementedError
+
+class SQLiteFTSSearch(TicketSearchBackend):
+    """FTS5 index over ticket titles and descriptions.
+
+    FTS5 rows are keyed by an integer. `tickets` has a VARCHAR primary key, so its
+    implicit rowid is not stable (VACUUM may renumber it); each ticket instead gets
+    a `docid` in tickets_fts_docs, an INTEGER PRIMARY KEY that never changes. The
+    FTS table is contentless (the text lives in `tickets` only), so the triggers
+    remove a ticket from the index with FTS5's 'delete' command and its old values.
+    """
+
+    TRIGGERS = (
+        """
+        CREATE TRIGGER IF NOT EXISTS tickets_fts_ai AFTER INSERT ON tickets BEGIN
+            INSERT INTO tickets_fts_docs(ticket_id) VALUES (new.id);
+            INSERT INTO tickets_fts(rowid, title, description)
+            VALUES ((SELECT docid FROM tickets_fts_docs WHERE ticket_id = new.id), new.title, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tickets_fts_ad AFTER DELETE ON tickets BEGIN
+            INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+            VALUES ('delete', (SELECT docid FROM tickets_fts_docs WHERE ticket_id = old.id), old.title, old.description);
+            DELETE FROM tickets_fts_docs WHERE ticket_id = old.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tickets_fts_au AFTER UPDATE OF title, description ON tickets BEGIN
+            INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+            VALUES ('delete', (SELECT docid FROM tickets_fts_docs WHERE ticket_id = old.id), old.title, old.description);
+            INSERT INTO tickets_fts(rowid, title, description)
+            VALUES ((SELECT docid FROM tickets_fts_docs WHERE ticket_id = new.id), new.title, new.description);
+        END
+        """,
+    )
+    TRIGGER_NAMES = ("tickets_fts_ai", "tickets_fts_ad", "tickets_fts_au")
+
+    def install(self, connection: Connection) -> None:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tickets_fts_docs'")
+        ).first()
+        if not exists:
+            # Replace the index of earlier versions, which was keyed by the tickets rowid
+            for trigger in self.TRIGGER_NAMES:
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+            connection.execute(text("DROP TABLE IF EXISTS tickets_fts"))
+
+            connection.execute(text(
+                "CREATE TABLE tickets_fts_docs (docid INTEGER PRIMARY KEY, ticket_id VARCHAR NOT NULL UNIQUE)"
+            ))
+            connection.execute(text("CREATE VIRTUAL TABLE tickets_fts USING fts5(title, description, content='')"))
+            # Index any tickets written before the search table existed
+            connection.execute(text("INSERT INTO tickets_fts_docs(ticket_id) SELECT id FROM tickets"))
+            connection.execute(text(
+                "INSERT INTO tickets_fts(rowid, title, description) "
+                "SELECT d.docid, t.title, t.description FROM tickets t JOIN tickets_fts_docs d ON d.ticket_id = t.id"
+            ))
+        for trigger in self.TRIGGERS:
+            connection.execute(text(trigger))
+
+    def query(self, org_id: str, search_text: str) -> Optional[Select]:
+        # Quote each word so user input cannot inject FTS5 syntax; trailing * allows prefix matches
+        terms = re.findall(r"\w+", search_text)
+        if not terms:
+            return None
+        match = " ".join(f'"{term}"*' for term in terms)
+
+        return (
+            select(models.Ticket)
+            .join(tickets_fts_docs, tickets_fts_docs.c.ticket_id == models.Ticket.id)
+            .join(tickets_fts, tickets_fts.c.rowid == tickets_fts_docs.c.docid)
+            .where(text("tickets_fts MATCH :match").bindparams(match=match))
+            .where(models.Ticket.organization_id == org_id)
+            .order_by(text("bm25(tickets_fts)"))
+        )
+
+class PostgresFullTextSearch(TicketSearchBackend):
+    # Must match the indexed expression exactly for the GIN index to be used
+    DOCUMENT_SQL = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+    def install(self, connection: Connection) -> None:
+        connection.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_tickets_search ON tickets USING GIN ({self.DOCUMENT_SQL})"
+        ))
+
+    def query(self, org_id: str, search_text: str) -> Optional[Select]:
+        if not search_text.strip():
+            return None
+        document = literal_column(self.DOCUMENT_SQL)
+        tsquery = func.websearch_to_tsquery("english", search_text)
+        return (
+            select(models.Ticket)
+            .where(models.Ticket.organization_id == org_id)
+            .where(document.op("@@")(tsquery))
+            .order_by(func.ts_rank(document, tsquery).desc())
+        )
+
+def get_search_backend(dialect_name: str) -> TicketSearchBackend:
+    if dialect_name == "postgresql":
+        return PostgresFullTextSearch()
+    return SQLiteFTSSearch()
+
+def install_search_index(engine) -> None:
+    """Create (or backfill) the full-text index; safe to call on every startup"""
+    with engine.begin() as connection:
+        get_search_backend(engine.dialect.name).install(connection)
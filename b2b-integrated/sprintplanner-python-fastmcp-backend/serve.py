@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Production launcher for the Ticket Board API
+
+Runs uvicorn with one worker process per available CPU (or WEB_CONCURRENCY).
+With more than one worker the MCP transport defaults to stateless mode, since
+an MCP session lives in the process that created it and the next request of
+that session may be routed to another worker. Stateless mode turns off MCP
+resource subscriptions; run a single worker (WEB_CONCURRENCY=1) to keep them.
+"""
+
+import logging
+import os
+
+import uvicorn
+from dotenv import load_dotenv
+
+load_dotenv(".env.local")
+
+logger = logging.getLogger("serve")
+
+def cpu_count() -> int:
+    """CPUs this process may run on (honours affinity masks and container cpusets)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def worker_count() -> int:
+    return int(os.getenv("WEB_CONCURRENCY", "0")) or cpu_count()
+
+def configure_mcp_transport(workers: int) -> bool:
+    """Pick the MCP transport mode for `workers` processes; returns True if it is stateless.
+
+    More than one worker defaults MCP_STATELESS_HTTP to true. Stateless HTTP has no
+    MCP sessions, so resource subscriptions are turned off in that mode.
+    """
+    if workers > 1:
+        os.environ.setdefault("MCP_STATELESS_HTTP", "true")
+    stateless = os.getenv("MCP_STATELESS_HTTP", "false").lower() in ("1", "true", "yes")
+    if stateless:
+        logger.info("MCP transport is stateless: resource subscriptions are off, clients can follow /api/tickets/stream instead")
+    elif workers > 1:
+        logger.warning("MCP_STATELESS_HTTP is off with %d workers: MCP sessions will fail when a request reaches another worker", workers)
+    if workers > 1 and not os.getenv("CHANGE_BROKER_REDIS_URL"):
+        logger.warning("CHANGE_BROKER_REDIS_URL is not set: change feeds only see writes made by their own worker")
+    return stateless
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    workers = worker_count()
+    configure_mcp_transport(workers)
+
+    # Create the schema and search index once here; the workers skip it
+    if os.getenv("SKIP_SCHEMA_SETUP", "false").lower() not in ("1", "true", "yes"):
+        from database import engine
+        from init_db import init_db
+
+        init_db()
+        engine.dispose()
+        os.environ["SKIP_SCHEMA_SETUP"] = "true"
+
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "3001")),
+        workers=workers,
+    )
+
+if __name__ == "__main__":
+    main()
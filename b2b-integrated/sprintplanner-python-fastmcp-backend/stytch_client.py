@@ -1,11 +1,16 @@
 import os
+import asyncio
 from typing import Optional, Dict, Any
 from dotenv import load_dotenv
 from stytch import B2BClient
+from jwks import SessionJWTVerifier
 
 # Load local environment for backend (project ID/secret, etc.)
 load_dotenv(".env.local")
 
+SESSION_CLAIM = "https://stytch.com/session"
+ORGANIZATION_CLAIM = "https://stytch.com/organization"
+
 class StytchClient:
     def __init__(self):
         self.project_id = os.getenv("STYTCH_PROJECT_ID")
@@ -23,14 +28,32 @@ class StytchClient:
             custom_base_url=self.domain,
         )
 
+        # Session JWTs are verified locally against the cached JWKS where possible
+        self.verifier = SessionJWTVerifier(
+            project_id=self.project_id,
+            jwks_uri=f"{self.domain}/v1/b2b/sessions/jwks/{self.project_id}",
+            issuers=[f"stytch.com/{self.project_id}", self.domain],
+        )
+
     async def verify_session(self, token: str) -> Optional[Dict[str, Any]]:
-        """Verify a Stytch B2B session (JWT or opaque token) using the official SDK."""
+        """Verify a Stytch B2B session (JWT or opaque token).
+
+        JWTs are checked locally when possible; opaque tokens, unknown signing keys
+        and JWTs close to expiry are verified with the official SDK in a worker thread.
+        """
         try:
             is_jwt = token.count(".") == 2
             if is_jwt:
-                resp = self.client.sessions.authenticate_jwt(session_jwt=token)
+                claims = await self.verifier.verify(token)
+                if claims is not None:
+                    return {
+                        "member_id": claims["sub"],
+                        "organization_id": claims.get(ORGANIZATION_CLAIM, {}).get("organization_id"),
+                        "session_id": claims.get(SESSION_CLAIM, {}).get("id"),
+                    }
+                resp = await asyncio.to_thread(self.client.sessions.authenticate, session_jwt=token)
             else:
-                resp = self.client.sessions.authenticate(session_token=token)
+                resp = await asyncio.to_thread(self.client.sessions.authenticate, session_token=token)
 
             # Extract from B2B response shape
             member_session = getattr(resp, "member_session", None)
@@ -0,0 +1,30 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+# Point the app at a throwaway database before any module creates its engine
+_tmpdir = tempfile.mkdtemp(prefix="sprintplanner-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'tickets.db')}"
+os.environ.setdefault("STYTCH_PROJECT_ID", "project-test")
+os.environ.setdefault("STYTCH_SECRET", "secret-test")
+os.environ.setdefault("STYTCH_DOMAIN", "https://test.stytch.example")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import crud  # noqa: E402
+import models  # noqa: E402
+from database import engine  # noqa: E402
+from search import install_search_index  # noqa: E402
+
+models.Base.metadata.create_all(bind=engine)
+install_search_index(engine)
+
+@pytest.fixture
+def org_id():
+    """A fresh organization, so tests never see each other's tickets or versions"""
+    org_id = f"org-{uuid.uuid4()}"
+    crud.ensure_organization(org_id)
+    return org_id
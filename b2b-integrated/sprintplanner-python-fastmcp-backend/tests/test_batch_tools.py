@@ -0,0 +1,83 @@
+import asyncio
+import uuid
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+import crud
+import mcp_server
+import schemas
+
+@pytest.fixture
+def org(org_id, monkeypatch):
+    monkeypatch.setattr(mcp_server, "get_organization_id_from_context", lambda: org_id)
+    return org_id
+
+def call(tool: str, **arguments):
+    async def run():
+        async with Client(mcp_server.mcp) as client:
+            return (await client.call_tool(tool, arguments)).data
+    return asyncio.run(run())
+
+def test_create_tickets_returns_a_result_per_ticket_in_order(org):
+    result = call("create_tickets", tickets=[{"title": f"ticket {i}", "assignee": "ada"} for i in range(3)])
+
+    assert [r["ok"] for r in result["results"]] == [True, True, True]
+    assert [r["ticket"]["title"] for r in result["results"]] == ["ticket 0", "ticket 1", "ticket 2"]
+    assert [r["ticket_id"] for r in result["results"]] == [t["id"] for t in crud.get_tickets(org)]
+
+def test_update_ticket_statuses_reports_failures_per_item(org):
+    ours = crud.create_ticket(schemas.TicketCreate(title="ours", assignee="ada"), org)
+    other_org = f"org-{uuid.uuid4()}"
+    crud.ensure_organization(other_org)
+    theirs = crud.create_ticket(schemas.TicketCreate(title="theirs", assignee="grace"), other_org)
+
+    result = call("update_ticket_statuses", updates=[
+        {"ticket_id": ours.id, "status": "done"},
+        {"ticket_id": ours.id, "status": "nope"},
+        {"ticket_id": "missing", "status": "done"},
+        {"ticket_id": theirs.id, "status": "done"},
+    ])
+
+    assert result["results"] == [
+        {"ticket_id": ours.id, "ok": True, "ticket": result["results"][0]["ticket"]},
+        {"ticket_id": ours.id, "ok": False, "error": "Invalid status"},
+        {"ticket_id": "missing", "ok": False, "error": "Ticket not found"},
+        {"ticket_id": theirs.id, "ok": False, "error": "Ticket not found"},
+    ]
+    assert result["results"][0]["ticket"]["status"] == "done"
+    # The valid update was applied; the other organization's ticket was not touched
+    assert crud.get_ticket(ours.id, org).status == "done"
+    assert crud.get_ticket(theirs.id, other_org).status == "backlog"
+
+def test_delete_tickets_reports_missing_tickets(org):
+    ticket = crud.create_ticket(schemas.TicketCreate(title="one", assignee="ada"), org)
+
+    result = call("delete_tickets", ticket_ids=[ticket.id, "missing"])
+
+    assert result["results"] == [
+        {"ticket_id": ticket.id, "ok": True},
+        {"ticket_id": "missing", "ok": False, "error": "Ticket not found"},
+    ]
+    assert crud.get_ticket(ticket.id, org) is None
+
+@pytest.mark.parametrize("tool, arguments", [
+    ("create_tickets", {"tickets": [{"title": "t", "assignee": "ada"}] * 3}),
+    ("update_ticket_statuses", {"updates": [{"ticket_id": "t", "status": "done"}] * 3}),
+    ("delete_tickets", {"ticket_ids": ["t"] * 3}),
+])
+def test_batches_over_the_limit_are_rejected_before_any_write(org, monkeypatch, tool, arguments):
+    monkeypatch.setattr(mcp_server, "MAX_BATCH_SIZE", 2)
+    version = crud.get_board_version(org)
+
+    with pytest.raises(ToolError, match="At most 2 items"):
+        call(tool, **arguments)
+    assert crud.get_board_version(org) == version
+
+def test_batches_at_the_limit_are_accepted(org, monkeypatch):
+    monkeypatch.setattr(mcp_server, "MAX_BATCH_SIZE", 2)
+
+    result = call("create_tickets", tickets=[{"title": "t", "assignee": "ada"}] * 2)
+
+    assert len(result["results"]) == 2
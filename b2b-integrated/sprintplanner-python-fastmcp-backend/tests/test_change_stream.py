@@ -0,0 +1,50 @@
+import asyncio
+
+import crud
+import events
+import schemas
+from database import run_db
+
+def next_event(stream):
+    return asyncio.wait_for(stream.__anext__(), 2)
+
+def test_write_between_version_read_and_first_event_is_delivered(org_id):
+    async def get_version_then_write():
+        # The stream has subscribed by now; a write committed right after the
+        # version read must still reach the client
+        version = await run_db(crud.get_board_version, org_id)
+        await run_db(crud.create_ticket, schemas.TicketCreate(title="racer", assignee="alice"), org_id)
+        return version
+
+    async def run():
+        stream = events.change_stream(events.broker, org_id, get_version_then_write)
+        try:
+            return [await next_event(stream) for _ in range(3)]
+        finally:
+            await stream.aclose()
+
+    retry, ready, change = asyncio.run(run())
+
+    assert retry.startswith("retry:")
+    assert ready.startswith("id: 0\nevent: ready\n")
+    assert change.startswith("id: 1\nevent: change\n")
+
+def test_write_before_version_read_is_covered_by_the_version(org_id):
+    async def write_then_get_version():
+        await run_db(crud.create_ticket, schemas.TicketCreate(title="early", assignee="alice"), org_id)
+        return await run_db(crud.get_board_version, org_id)
+
+    async def run():
+        stream = events.change_stream(events.broker, org_id, write_then_get_version)
+        try:
+            retry, ready = [await next_event(stream) for _ in range(2)]
+            await run_db(crud.create_ticket, schemas.TicketCreate(title="later", assignee="alice"), org_id)
+            return ready, await next_event(stream)
+        finally:
+            await stream.aclose()
+
+    ready, change = asyncio.run(run())
+
+    assert ready.startswith("id: 1\nevent: ready\n")
+    # The queued event for version 1 is not repeated
+    assert change.startswith("id: 2\nevent: change\n")
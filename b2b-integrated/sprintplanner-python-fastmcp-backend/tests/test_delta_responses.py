@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from fastmcp import Client
+
+import mcp_server
+from main import app, verify_stytch_session
+
+@pytest.fixture
+def client(org_id):
+    app.dependency_overrides[verify_stytch_session] = lambda: {"organization_id": org_id}
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+def create(client, title: str, **kwargs):
+    return client.post("/api/tickets", json={"title": title, "assignee": "ada"}, **kwargs)
+
+def test_writes_return_the_full_list_by_default(client):
+    create(client, "one")
+    response = create(client, "two")
+
+    assert response.status_code == 200
+    assert [t["title"] for t in response.json()["tickets"]] == ["one", "two"]
+
+@pytest.mark.parametrize("kwargs", [{"params": {"return": "delta"}}, {"headers": {"Prefer": "return=minimal"}}])
+def test_create_returns_only_the_new_ticket_and_version(client, kwargs):
+    first = create(client, "one", **kwargs).json()
+    second = create(client, "two", **kwargs).json()
+
+    assert set(first) == {"ticket", "deleted_id", "version"}
+    assert (first["ticket"]["title"], second["ticket"]["title"]) == ("one", "two")
+    assert first["deleted_id"] is None
+    assert second["version"] == first["version"] + 1
+
+def test_status_update_and_delete_return_deltas(client):
+    created = create(client, "one", params={"return": "delta"}).json()
+    ticket_id = created["ticket"]["id"]
+
+    updated = client.post(
+        f"/api/tickets/{ticket_id}/status", json={"status": "done"}, params={"return": "delta"}
+    ).json()
+    deleted = client.delete(f"/api/tickets/{ticket_id}", params={"return": "delta"}).json()
+
+    assert (updated["ticket"]["id"], updated["ticket"]["status"]) == (ticket_id, "done")
+    assert updated["version"] == created["version"] + 1
+    assert (deleted["ticket"], deleted["deleted_id"]) == (None, ticket_id)
+    assert deleted["version"] == updated["version"] + 1
+    assert client.get("/api/tickets").json()["tickets"] == []
+
+def test_delta_writes_of_missing_tickets_are_not_found(client):
+    assert client.post("/api/tickets/missing/status", json={"status": "done"}, params={"return": "delta"}).status_code == 404
+    assert client.delete("/api/tickets/missing", params={"return": "delta"}).status_code == 404
+
+def test_mcp_writes_return_only_the_changed_ticket(org_id, monkeypatch):
+    monkeypatch.setattr(mcp_server, "get_organization_id_from_context", lambda: org_id)
+
+    async def run():
+        async with Client(mcp_server.mcp) as client:
+            async def call(tool, **arguments):
+                return (await client.call_tool(tool, arguments)).data
+
+            before = await call("list_tickets")
+            created = await call("create_ticket", title="one", assignee="ada")
+            updated = await call("update_ticket_status", ticket_id=created["id"], status="done")
+            after = await call("list_tickets")
+            return before, created, updated, after
+
+    before, created, updated, after = asyncio.run(run())
+
+    assert (created["title"], updated["status"]) == ("one", "done")
+    assert updated["id"] == created["id"]
+    # Clients holding the list see that it moved on by comparing versions
+    assert after["version"] == before["version"] + 2
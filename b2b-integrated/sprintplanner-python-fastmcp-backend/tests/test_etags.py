@@ -0,0 +1,80 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from fastmcp import Client
+
+import crud
+import etags
+import mcp_server
+from main import app, verify_stytch_session
+
+@pytest.fixture
+def client(org_id):
+    app.dependency_overrides[verify_stytch_session] = lambda: {"organization_id": org_id}
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+def create(client, title: str):
+    return client.post("/api/tickets", json={"title": title, "assignee": "ada"})
+
+def test_unchanged_list_is_not_modified(client):
+    create(client, "one")
+    first = client.get("/api/tickets")
+    etag = first.headers["ETag"]
+
+    second = client.get("/api/tickets", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+
+def test_write_changes_the_etag(client):
+    etag = client.get("/api/tickets").headers["ETag"]
+    create(client, "one")
+
+    response = client.get("/api/tickets", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert [t["title"] for t in response.json()["tickets"]] == ["one"]
+
+def test_write_through_mcp_changes_the_etag_and_page_version(client, org_id, monkeypatch):
+    monkeypatch.setattr(mcp_server, "get_organization_id_from_context", lambda: org_id)
+    etag = client.get("/api/tickets").headers["ETag"]
+
+    async def run():
+        async with Client(mcp_server.mcp) as mcp_client:
+            await mcp_client.call_tool("create_ticket", {"title": "one", "assignee": "ada"})
+            return (await mcp_client.call_tool("list_tickets", {})).data
+
+    page = asyncio.run(run())
+    response = client.get("/api/tickets", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    # MCP pages carry the same version the ETag is derived from
+    assert response.headers["ETag"] == etags.make_etag(org_id, page["version"])
+
+@pytest.mark.parametrize("header", ['W/{etag}', '"other", {etag}', "*"])
+def test_weak_lists_and_wildcard_match(client, header):
+    etag = client.get("/api/tickets").headers["ETag"]
+
+    response = client.get("/api/tickets", headers={"If-None-Match": header.format(etag=etag)})
+
+    assert response.status_code == 304
+
+def test_etag_of_another_organization_does_not_match(client, org_id):
+    other_org = f"org-{uuid.uuid4()}"
+    crud.ensure_organization(other_org)
+    assert crud.get_board_version(org_id) == crud.get_board_version(other_org)
+    etag = client.get("/api/tickets").headers["ETag"]
+
+    app.dependency_overrides[verify_stytch_session] = lambda: {"organization_id": other_org}
+    response = client.get("/api/tickets", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
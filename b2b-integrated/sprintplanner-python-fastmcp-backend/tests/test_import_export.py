@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import ndjson
+
+@pytest.fixture
+def client(org_id):
+    main.app.dependency_overrides[main.verify_stytch_session] = lambda: {"organization_id": org_id}
+    yield TestClient(main.app)
+    main.app.dependency_overrides.pop(main.verify_stytch_session, None)
+
+def body(*lines: str) -> bytes:
+    return "\n".join(lines).encode()
+
+def export(client) -> list:
+    response = client.get("/api/tickets/export")
+    assert response.headers["content-type"] == ndjson.NDJSON_MEDIA_TYPE
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def test_import_reports_invalid_lines_and_export_streams_tickets(client):
+    response = client.post("/api/tickets:bulk", content=body(
+        '{"title": "one", "assignee": "ada"}',
+        "",
+        "not json",
+        '{"title": "two", "assignee": "ada", "status": "done", "description": "shipped"}',
+        '{"title": "three", "assignee": "ada", "status": "nope"}',
+        '{"title": "four"}',
+    ))
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (2, 3)
+    assert [error["line"] for error in result["errors"]] == [3, 5, 6]
+
+    tickets = export(client)
+    assert [(t["title"], t["status"], t["description"]) for t in tickets] == [
+        ("one", "backlog", None),
+        ("two", "done", "shipped"),
+    ]
+    assert set(tickets[0]) == {"id", "title", "assignee", "status", "description", "created_at", "updated_at"}
+
+def test_import_is_split_into_chunks(client, monkeypatch):
+    monkeypatch.setattr(main, "IMPORT_CHUNK_SIZE", 2)
+
+    lines = (json.dumps({"title": f"ticket {i}", "assignee": "ada"}) for i in range(5))
+    response = client.post("/api/tickets:bulk", content=body(*lines))
+
+    assert response.json()["created"] == 5
+    assert sorted(t["title"] for t in export(client)) == [f"ticket {i}" for i in range(5)]
+
+def test_line_too_long_reports_the_tickets_already_imported(client, monkeypatch):
+    monkeypatch.setattr(main, "IMPORT_CHUNK_SIZE", 2)
+    monkeypatch.setattr(ndjson, "MAX_LINE_BYTES", 64)
+
+    response = client.post("/api/tickets:bulk", content=body(
+        '{"title": "one", "assignee": "ada"}',
+        '{"title": "two", "assignee": "ada"}',
+        '{"title": "three", "assignee": "ada"}',
+        '{"title": "' + "x" * 100 + '", "assignee": "ada"}',
+        '{"title": "after", "assignee": "ada"}',
+    ))
+
+    assert response.status_code == 413
+    result = response.json()
+    assert (result["created"], result["failed"], result["errors"]) == (3, 0, [])
+    assert result["detail"] == "Line 4 exceeds 64 bytes"
+    assert sorted(t["title"] for t in export(client)) == ["one", "three", "two"]
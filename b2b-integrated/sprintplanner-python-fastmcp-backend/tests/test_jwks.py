@@ -0,0 +1,155 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from jwks import JWKSCache, SessionJWTVerifier
+
+PROJECT_ID = "project-test-jwks"
+ISSUER = f"stytch.com/{PROJECT_ID}"
+
+def make_key(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid=kid, use="sig", alg="RS256")
+    return private_key, jwk
+
+KEYS = {kid: make_key(kid) for kid in ("key-1", "key-2")}
+
+def make_token(kid: str = "key-1", expires_in: float = 300.0, **claims) -> str:
+    payload = {
+        "sub": "member-1",
+        "aud": [PROJECT_ID],
+        "iss": ISSUER,
+        "exp": int(time.time() + expires_in),
+        **claims,
+    }
+    return jwt.encode(payload, KEYS[kid][0], algorithm="RS256", headers={"kid": kid})
+
+class FakeJWKS:
+    """Serves a JWKS document on localhost and counts how often it was fetched"""
+
+    def __init__(self):
+        self.kids = ["key-1"]
+        self.fetches = 0
+        jwks = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                jwks.fetches += 1
+                body = json.dumps({"keys": [KEYS[kid][1] for kid in jwks.kids]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.uri = f"http://127.0.0.1:{self.server.server_port}/jwks"
+
+@pytest.fixture
+def fake_jwks():
+    jwks = FakeJWKS()
+    thread = threading.Thread(target=jwks.server.serve_forever, daemon=True)
+    thread.start()
+    yield jwks
+    jwks.server.shutdown()
+    jwks.server.server_close()
+
+def make_verifier(fake_jwks: FakeJWKS, **jwks_options) -> SessionJWTVerifier:
+    return SessionJWTVerifier(
+        project_id=PROJECT_ID,
+        jwks_uri=fake_jwks.uri,
+        issuers=[ISSUER],
+        jwks=JWKSCache(fake_jwks.uri, **jwks_options),
+    )
+
+def test_valid_token_is_verified_and_keys_are_cached(fake_jwks):
+    verifier = make_verifier(fake_jwks)
+
+    async def run():
+        first = await verifier.verify(make_token(sub="member-1"))
+        second = await verifier.verify(make_token(sub="member-2"))
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert (first["sub"], second["sub"]) == ("member-1", "member-2")
+    assert fake_jwks.fetches == 1
+
+def test_keys_are_refetched_after_the_ttl(fake_jwks):
+    verifier = make_verifier(fake_jwks, ttl_seconds=0.0)
+
+    async def run():
+        await verifier.verify(make_token(sub="member-1"))
+        await verifier.verify(make_token(sub="member-2"))
+
+    asyncio.run(run())
+    assert fake_jwks.fetches == 2
+
+def test_unknown_kid_refreshes_the_keys(fake_jwks):
+    verifier = make_verifier(fake_jwks, min_refetch_interval_seconds=0.0)
+
+    async def run():
+        await verifier.verify(make_token("key-1"))
+        # The signing key rotates after the first fetch
+        fake_jwks.kids.append("key-2")
+        return await verifier.verify(make_token("key-2"))
+
+    claims = asyncio.run(run())
+
+    assert claims["sub"] == "member-1"
+    assert fake_jwks.fetches == 2
+
+def test_unknown_kid_refetches_are_rate_limited(fake_jwks):
+    verifier = make_verifier(fake_jwks, min_refetch_interval_seconds=60.0)
+
+    async def run():
+        await verifier.verify(make_token("key-1"))
+        fake_jwks.kids.append("key-2")
+        return await verifier.verify(make_token("key-2"))
+
+    # Defers to the Stytch API rather than hitting the JWKS endpoint again
+    assert asyncio.run(run()) is None
+    assert fake_jwks.fetches == 1
+
+@pytest.mark.parametrize("expires_in", [-60.0, 5.0])
+def test_expired_or_expiring_token_is_not_trusted_locally(fake_jwks, expires_in):
+    verifier = make_verifier(fake_jwks)
+    token = make_token(expires_in=expires_in)
+
+    assert asyncio.run(verifier.verify(token)) is None
+    assert verifier.cache.get(token) is None
+
+def test_token_for_another_audience_is_rejected(fake_jwks):
+    verifier = make_verifier(fake_jwks)
+
+    with pytest.raises(jwt.InvalidAudienceError):
+        asyncio.run(verifier.verify(make_token(aud=["another-project"])))
+
+def test_token_from_another_issuer_is_rejected(fake_jwks):
+    verifier = make_verifier(fake_jwks)
+
+    with pytest.raises(jwt.InvalidIssuerError):
+        asyncio.run(verifier.verify(make_token(iss="stytch.com/another-project")))
+
+def test_token_signed_with_another_key_is_rejected(fake_jwks):
+    verifier = make_verifier(fake_jwks)
+    # Claims to be key-1 but is signed with key-2
+    token = jwt.encode(
+        {"sub": "member-1", "aud": [PROJECT_ID], "iss": ISSUER, "exp": int(time.time() + 300)},
+        KEYS["key-2"][0],
+        algorithm="RS256",
+        headers={"kid": "key-1"},
+    )
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        asyncio.run(verifier.verify(token))
@@ -0,0 +1,67 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+import crud
+import list_cache
+import schemas
+from main import app
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh cache, so hit and miss counts belong to the test"""
+    fresh = list_cache.ListCache(list_cache.InMemoryCacheBackend())
+    monkeypatch.setattr(list_cache, "cache", fresh)
+    return fresh
+
+def create(org_id: str, title: str):
+    return crud.create_ticket(schemas.TicketCreate(title=title, assignee="alice"), org_id)
+
+def titles(tickets):
+    return [ticket["title"] for ticket in tickets]
+
+def test_repeated_reads_are_served_from_the_cache(cache, org_id):
+    create(org_id, "first")
+
+    assert titles(crud.get_tickets(org_id)) == ["first"]
+    assert titles(crud.get_tickets(org_id)) == ["first"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_write_invalidates_through_the_version_bump(cache, org_id, monkeypatch):
+    create(org_id, "first")
+    assert titles(crud.get_tickets(org_id)) == ["first"]
+
+    # As if the write ran on another worker: this worker's entry is never dropped
+    monkeypatch.setattr(cache, "invalidate", lambda tenant: None)
+    create(org_id, "second")
+
+    assert titles(crud.get_tickets(org_id)) == ["first", "second"]
+    assert (cache.hits, cache.misses) == (0, 2)
+
+def test_tenants_at_the_same_version_never_share_entries(cache):
+    org_a, org_b = f"org-{uuid.uuid4()}", f"org-{uuid.uuid4()}"
+    for org_id, title in ((org_a, "a's ticket"), (org_b, "b's ticket")):
+        crud.ensure_organization(org_id)
+        create(org_id, title)
+    assert crud.get_board_version(org_a) == crud.get_board_version(org_b)
+
+    assert titles(crud.get_tickets(org_a)) == ["a's ticket"]
+    assert titles(crud.get_tickets(org_b)) == ["b's ticket"]
+    assert titles(crud.get_tickets(org_a)) == ["a's ticket"]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_entry_of_another_version_is_a_miss(cache):
+    cache.put("org", "tickets", 1, ["old"])
+
+    assert cache.get("org", "tickets", 2) is None
+    assert cache.get("org", "tickets", 1) == ["old"]
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 1}
+
+def test_hit_rate_is_exposed(cache, org_id):
+    crud.get_tickets(org_id)
+    crud.get_tickets(org_id)
+
+    stats = TestClient(app).get("/api/metrics").json()["list_cache"]
+
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
@@ -0,0 +1,116 @@
+import os
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+import models
+from search import get_search_backend, install_search_index
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The schema init_db.py created before any migration existed
+LEGACY_SCHEMA = (
+    """
+    CREATE TABLE organizations (
+        id VARCHAR NOT NULL PRIMARY KEY,
+        name VARCHAR NOT NULL,
+        created_at DATETIME DEFAULT (CURRENT_TIMESTAMP),
+        updated_at DATETIME
+    )
+    """,
+    """
+    CREATE TABLE tickets (
+        id VARCHAR NOT NULL PRIMARY KEY,
+        title VARCHAR NOT NULL,
+        assignee VARCHAR NOT NULL,
+        status VARCHAR NOT NULL,
+        description TEXT,
+        organization_id VARCHAR NOT NULL REFERENCES organizations (id),
+        created_at DATETIME DEFAULT (CURRENT_TIMESTAMP),
+        updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP)
+    )
+    """,
+    "INSERT INTO organizations (id, name) VALUES ('org-legacy', 'org-legacy')",
+    "INSERT INTO tickets (id, title, assignee, status, description, organization_id) "
+    "VALUES ('t-legacy', 'Legacy login bug', 'ana', 'backlog', 'Fails on Safari', 'org-legacy')",
+)
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.execute(text(statement))
+    yield engine
+    engine.dispose()
+
+def migrate(engine, action, revision: str) -> None:
+    config = Config()
+    config.set_main_option("script_location", os.path.join(APP_DIR, "migrations"))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        action(config, revision)
+
+def search(connection, org_id: str, query: str):
+    return [row.id for row in connection.execute(get_search_backend("sqlite").query(org_id, query))]
+
+def index_names(connection):
+    return set(connection.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tickets' AND sql IS NOT NULL"
+    )).scalars())
+
+def test_upgrade_head_creates_every_table_the_app_uses(legacy_engine):
+    migrate(legacy_engine, command.upgrade, "head")
+
+    with legacy_engine.connect() as connection:
+        inspector = inspect(connection)
+        assert "ticket_board_versions" in inspector.get_table_names()
+        assert index_names(connection) == {
+            "ix_tickets_org_created_at", "ix_tickets_org_status", "ix_tickets_org_lower_assignee"
+        }
+        # The legacy ticket was backfilled into the docid-keyed search index
+        assert search(connection, "org-legacy", "safari") == ["t-legacy"]
+        connection.execute(text(
+            "INSERT INTO ticket_board_versions (organization_id, version) VALUES ('org-legacy', 1)"
+        ))
+
+def test_each_revision_installs_its_own_search_layout(legacy_engine):
+    migrate(legacy_engine, command.upgrade, "0002")
+    with legacy_engine.connect() as connection:
+        # 0002 shipped the rowid-keyed index; the docid map only arrives with 0003
+        assert "tickets_fts_docs" not in inspect(connection).get_table_names()
+        ids = connection.execute(text(
+            "SELECT t.id FROM tickets_fts f JOIN tickets t ON t.rowid = f.rowid WHERE tickets_fts MATCH 'safari'"
+        )).scalars().all()
+        assert ids == ["t-legacy"]
+
+    migrate(legacy_engine, command.upgrade, "0003")
+    with legacy_engine.connect() as connection:
+        assert "tickets_fts_docs" in inspect(connection).get_table_names()
+        assert search(connection, "org-legacy", "safari") == ["t-legacy"]
+
+def test_downgrade_to_base_removes_what_the_revisions_added(legacy_engine):
+    migrate(legacy_engine, command.upgrade, "head")
+    migrate(legacy_engine, command.downgrade, "0002")
+    with legacy_engine.connect() as connection:
+        tables = inspect(connection).get_table_names()
+        assert "ticket_board_versions" not in tables
+        assert "tickets_fts_docs" not in tables
+        assert "tickets_fts" in tables
+
+    migrate(legacy_engine, command.downgrade, "base")
+    with legacy_engine.connect() as connection:
+        assert "tickets_fts" not in inspect(connection).get_table_names()
+        assert index_names(connection) == set()
+
+def test_upgrade_is_a_no_op_on_a_database_created_by_init_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    install_search_index(engine)
+
+    migrate(engine, command.upgrade, "head")
+    with engine.connect() as connection:
+        assert "tickets_fts_docs" in inspect(connection).get_table_names()
+    engine.dispose()
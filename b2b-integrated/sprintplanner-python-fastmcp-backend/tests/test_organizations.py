@@ -0,0 +1,90 @@
+import threading
+import uuid
+
+import pytest
+from sqlalchemy import event, func, select
+
+import crud
+import models
+from database import engine, session_scope, transaction
+
+@pytest.fixture
+def statements():
+    """SQL statements sent to the write engine while the test runs"""
+    sent = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield sent
+    event.remove(engine, "before_cursor_execute", record)
+
+def organization_rows(org_id: str) -> int:
+    with session_scope() as db:
+        return db.scalar(select(func.count()).select_from(models.Organization).where(models.Organization.id == org_id))
+
+def test_repeated_calls_touch_the_database_once(statements):
+    org_id = f"org-{uuid.uuid4()}"
+
+    for _ in range(5):
+        crud.ensure_organization(org_id)
+
+    assert len([s for s in statements if "organizations" in s]) == 1
+    assert organization_rows(org_id) == 1
+
+def test_existing_organization_is_left_as_is():
+    org_id = f"org-{uuid.uuid4()}"
+    crud.ensure_organization(org_id, name="Acme")
+    crud.forget_organization(org_id)
+
+    crud.ensure_organization(org_id, name="Other")
+
+    assert crud.get_organization(org_id).name == "Acme"
+    assert organization_rows(org_id) == 1
+
+def test_concurrent_calls_create_one_row():
+    org_id = f"org-{uuid.uuid4()}"
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def ensure():
+        barrier.wait()
+        try:
+            crud.ensure_organization(org_id)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=ensure) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert organization_rows(org_id) == 1
+    assert org_id in crud._known_organizations
+
+def test_organization_is_remembered_only_after_commit():
+    org_id = f"org-{uuid.uuid4()}"
+
+    with pytest.raises(RuntimeError):
+        with transaction():
+            crud.ensure_organization(org_id)
+            raise RuntimeError("roll back")
+
+    assert org_id not in crud._known_organizations
+    assert organization_rows(org_id) == 0
+    # The next call inserts the row instead of trusting the rolled-back one
+    crud.ensure_organization(org_id)
+    assert organization_rows(org_id) == 1
+
+def test_known_organizations_are_bounded(monkeypatch):
+    monkeypatch.setattr(crud, "KNOWN_ORGANIZATIONS_MAX", 2)
+    org_ids = [f"org-{uuid.uuid4()}" for _ in range(3)]
+
+    for org_id in org_ids:
+        crud.ensure_organization(org_id)
+
+    assert list(crud._known_organizations)[-2:] == org_ids[1:]
+    assert org_ids[0] not in crud._known_organizations
@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+from sqlalchemy import update
+
+import crud
+import mcp_server
+import models
+import pagination
+import schemas
+from database import session_scope
+
+@pytest.fixture
+def tickets(org_id, monkeypatch):
+    """Seven tickets of one organization, all created in the same second"""
+    monkeypatch.setattr(mcp_server, "get_organization_id_from_context", lambda: org_id)
+    created = crud.create_tickets(
+        [schemas.TicketCreate(title=f"ticket {i}", assignee="ada") for i in range(7)], org_id
+    )
+    with session_scope() as db:
+        db.execute(
+            update(models.Ticket)
+            .where(models.Ticket.organization_id == org_id)
+            .values(created_at=datetime(2024, 1, 1, 12, 0, 0))
+        )
+    return sorted(ticket.id for ticket in created)
+
+def call(tool: str, **arguments):
+    async def run():
+        async with Client(mcp_server.mcp) as client:
+            return (await client.call_tool(tool, arguments)).structured_content
+    return asyncio.run(run())
+
+def test_walk_all_pages_with_ties_on_created_at(tickets):
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = call("list_tickets", cursor=cursor, limit=3, fields=["title"])
+        seen += [ticket["id"] for ticket in page["tickets"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # Tickets created in the same second are ordered by id, none skipped or repeated
+    assert seen == tickets
+    assert pages == 3
+    assert set(page["tickets"][0]) == {"id", "title"}
+
+def test_filtered_search_pages_use_the_same_cursor(tickets, org_id):
+    crud.create_ticket(schemas.TicketCreate(title="other", assignee="grace"), org_id)
+
+    first = call("search_tickets", assignee="ada", limit=4)
+    second = call("search_tickets", assignee="ada", limit=4, cursor=first["next_cursor"])
+
+    assert [t["id"] for t in first["tickets"] + second["tickets"]] == tickets
+    assert second["next_cursor"] is None
+
+def test_invalid_cursor_is_rejected(tickets):
+    with pytest.raises(ToolError, match="Invalid cursor"):
+        call("list_tickets", cursor="not-a-cursor")
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        pagination.decode_cursor(pagination.encode_cursor(datetime(2024, 1, 1), "id")[:-4])
+
+@pytest.mark.parametrize("arguments", [{"title_contains": "ticket"}, {"cursor": "abc"}])
+def test_query_cannot_be_combined_with_paging_filters(tickets, arguments):
+    with pytest.raises(ToolError, match="cannot be combined"):
+        call("search_tickets", query="ticket", **arguments)
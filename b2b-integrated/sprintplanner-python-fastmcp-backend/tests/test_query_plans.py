@@ -0,0 +1,81 @@
+"""EXPLAIN QUERY PLAN checks that tenant-scoped ticket queries are served by the tenant indexes"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import sqlite
+
+import crud
+import models
+import schemas
+from database import read_engine
+
+@contextmanager
+def captured_ticket_queries():
+    """Collect the (sql, parameters) of every ticket query sent through the read pool"""
+    queries = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM tickets" in statement and not statement.startswith("EXPLAIN"):
+            queries.append((statement, parameters))
+
+    event.listen(read_engine, "before_cursor_execute", capture)
+    try:
+        yield queries
+    finally:
+        event.remove(read_engine, "before_cursor_execute", capture)
+
+def query_plan(statement, parameters=()) -> str:
+    with read_engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(row[-1] for row in rows)
+
+def plans_of(call) -> list:
+    with captured_ticket_queries() as queries:
+        call()
+    assert queries, "no ticket query was captured"
+    return [query_plan(statement, parameters) for statement, parameters in queries]
+
+@pytest.fixture
+def board(org_id):
+    for i in range(5):
+        crud.create_ticket(schemas.TicketCreate(title=f"ticket {i}", assignee="Alice"), org_id)
+    return org_id
+
+@pytest.mark.parametrize("call", [
+    lambda org_id: crud.get_tickets(org_id),
+    lambda org_id: crud.get_tickets_page(org_id, 10),
+    lambda org_id: crud.search_tickets(org_id),
+], ids=["get_tickets", "get_tickets_page", "search_tickets"])
+def test_lists_walk_the_created_at_index(board, call):
+    for plan in plans_of(lambda: call(board)):
+        assert "USING INDEX ix_tickets_org_created_at" in plan
+        # The index order is the list order: no sort step
+        assert "TEMP B-TREE" not in plan
+
+@pytest.mark.parametrize("call", [
+    lambda org_id: crud.search_tickets(org_id, status="backlog"),
+    lambda org_id: crud.search_tickets(org_id, assignee="alice"),
+    lambda org_id: crud.get_tickets_page(org_id, 10, status="backlog", assignee="alice"),
+    lambda org_id: crud.get_ticket_statistics(org_id),
+], ids=["status", "assignee", "page_filters", "statistics"])
+def test_filters_and_statistics_use_a_tenant_index(board, call):
+    for plan in plans_of(lambda: call(board)):
+        assert "ix_tickets_org_" in plan
+        assert "SCAN tickets" not in plan
+
+def test_status_counts_are_read_from_the_status_index(board):
+    status_plan = plans_of(lambda: crud.get_ticket_statistics(board))[0]
+    assert "COVERING INDEX ix_tickets_org_status" in status_plan
+
+@pytest.mark.parametrize("filters, index", [
+    ({"status": "backlog"}, "ix_tickets_org_status"),
+    # The lower(assignee) filter must match the expression index exactly
+    ({"assignee": "Alice"}, "ix_tickets_org_lower_assignee"),
+])
+def test_filter_expressions_match_their_indexes(board, filters, index):
+    stmt = select(models.Ticket.id).where(*crud._ticket_filters(board, **filters))
+    compiled = stmt.compile(dialect=sqlite.dialect())
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup)
+    assert f"INDEX {index}" in query_plan(str(compiled), parameters)
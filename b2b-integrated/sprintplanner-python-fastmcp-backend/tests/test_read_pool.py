@@ -0,0 +1,32 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import crud
+import schemas
+from database import engine, read_engine
+from main import app, verify_stytch_session
+
+def test_list_reads_use_the_read_pool(org_id):
+    crud.create_ticket(schemas.TicketCreate(title="first", assignee="alice"), org_id)
+    checkouts = {"write": 0, "read": 0}
+
+    def count(pool):
+        def on_checkout(*args):
+            checkouts[pool] += 1
+        return on_checkout
+
+    write_listener, read_listener = count("write"), count("read")
+    event.listen(engine, "checkout", write_listener)
+    event.listen(read_engine, "checkout", read_listener)
+    app.dependency_overrides[verify_stytch_session] = lambda: {"organization_id": org_id}
+    try:
+        response = TestClient(app).get("/api/tickets")
+    finally:
+        app.dependency_overrides.clear()
+        event.remove(engine, "checkout", write_listener)
+        event.remove(read_engine, "checkout", read_listener)
+
+    assert response.status_code == 200
+    assert [t["title"] for t in response.json()["tickets"]] == ["first"]
+    assert checkouts["write"] == 0
+    assert checkouts["read"] >= 1
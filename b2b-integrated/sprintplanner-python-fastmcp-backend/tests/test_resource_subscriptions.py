@@ -0,0 +1,99 @@
+import asyncio
+import gc
+
+from fastmcp import Client, FastMCP
+from mcp import types
+
+from events import ChangeEvent, InProcessChangeBroker, ResourceSubscriptions
+
+URI = "tickets://authenticated"
+
+def make_server(broker: InProcessChangeBroker):
+    mcp = FastMCP("subscriptions-test")
+
+    @mcp.resource(URI)
+    def tickets() -> str:
+        return "[]"
+
+    subscriptions = ResourceSubscriptions(broker)
+    subscriptions.install(mcp, lambda: "org-1")
+    return mcp, subscriptions
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+def test_subscribed_session_is_notified_and_dropped_when_it_closes():
+    broker = InProcessChangeBroker()
+    mcp, subscriptions = make_server(broker)
+    updated = []
+
+    async def on_message(message):
+        if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ResourceUpdatedNotification):
+            updated.append(str(message.root.params.uri))
+
+    async def run():
+        async with Client(mcp, message_handler=on_message) as client:
+            await client.session.subscribe_resource(URI)
+            assert len(subscriptions._sessions) == 1
+
+            broker.publish(ChangeEvent(tenant="org-1", version=1, op="created", ids=["t1"]))
+            await wait_for(lambda: updated)
+            assert updated == [URI]
+        # The client went away without unsubscribing
+        gc.collect()
+        await wait_for(lambda: not broker._listeners)
+
+    asyncio.run(run())
+    assert len(subscriptions._sessions) == 0
+
+def test_unsubscribing_the_last_uri_ends_the_broker_subscription():
+    broker = InProcessChangeBroker()
+    mcp, subscriptions = make_server(broker)
+
+    async def run():
+        async with Client(mcp) as client:
+            await client.session.subscribe_resource(URI)
+            assert "org-1" in broker._listeners
+            await client.session.unsubscribe_resource(URI)
+            assert not broker._listeners
+            assert len(subscriptions._sessions) == 0
+
+    asyncio.run(run())
+
+def test_listener_of_a_collected_session_removes_itself():
+    broker = InProcessChangeBroker()
+    subscriptions = ResourceSubscriptions(broker)
+
+    class Session:
+        async def send_resource_updated(self, uri):
+            pass
+
+    async def subscribe_and_close_loop():
+        session = Session()
+        subscriptions.subscribe(session, "org-1", URI)
+        return session
+
+    session = asyncio.run(subscribe_and_close_loop())
+    # Collected after its loop closed, so the finalizer cannot schedule the unsubscribe
+    del session
+    gc.collect()
+    assert "org-1" in broker._listeners
+
+    broker.publish(ChangeEvent(tenant="org-1", version=1, op="created"))
+    assert not broker._listeners
+
+def test_server_advertises_resource_subscriptions():
+    mcp, _ = make_server(InProcessChangeBroker())
+
+    async def run():
+        async with Client(mcp) as client:
+            return client.initialize_result.capabilities
+
+    capabilities = asyncio.run(run())
+
+    assert capabilities.resources.subscribe is True
+    assert types.SubscribeRequest in mcp._mcp_server.request_handlers
+    assert types.UnsubscribeRequest in mcp._mcp_server.request_handlers
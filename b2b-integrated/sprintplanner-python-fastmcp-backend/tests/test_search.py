@@ -0,0 +1,80 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import schemas
+import search
+from database import engine
+
+def create(org_id: str, title: str, description: str = None) -> str:
+    ticket = schemas.TicketCreate(title=title, assignee="alice", description=description)
+    return crud.create_ticket(ticket, org_id).id
+
+def titles(org_id: str, query: str):
+    return [row.title for row in crud.full_text_search_tickets(org_id, query)]
+
+def vacuum() -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("VACUUM")
+
+def renumber_rowids(org_id: str) -> None:
+    """Move the organization's tickets to new rowids, as VACUUM, a dump and restore or a
+    table rebuild may do to a table without an INTEGER PRIMARY KEY"""
+    with engine.begin() as connection:
+        connection.execute(
+            text("UPDATE tickets SET rowid = rowid + 1000000 WHERE organization_id = :org_id"),
+            {"org_id": org_id},
+        )
+
+def test_search_survives_vacuum(org_id):
+    doomed = create(org_id, "alpha login crash")
+    create(org_id, "beta signup form")
+    create(org_id, "gamma payment timeout", "checkout spins forever")
+    crud.delete_ticket(doomed, org_id)
+
+    # SQLite only sometimes renumbers on VACUUM; do it explicitly so the test does not depend on it
+    renumber_rowids(org_id)
+    vacuum()
+
+    assert titles(org_id, "gamma") == ["gamma payment timeout"]
+    assert titles(org_id, "checkout") == ["gamma payment timeout"]
+    assert titles(org_id, "signup") == ["beta signup form"]
+    assert titles(org_id, "alpha") == []
+
+def test_updates_and_deletes_keep_the_index_in_sync(org_id):
+    ticket_id = create(org_id, "flaky build", "fails on ci")
+    crud.update_ticket(ticket_id, schemas.TicketUpdate(title="stable build"), org_id)
+
+    assert titles(org_id, "flaky") == []
+    assert titles(org_id, "stable ci") == ["stable build"]
+
+    crud.delete_ticket(ticket_id, org_id)
+    vacuum()
+    assert titles(org_id, "stable") == []
+
+def test_install_replaces_a_rowid_keyed_index():
+    legacy = create_engine("sqlite://")
+    models.Base.metadata.create_all(bind=legacy)
+    with legacy.begin() as connection:
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE tickets_fts USING fts5("
+            "title, description, content='tickets', content_rowid='rowid')"
+        ))
+        connection.execute(text(
+            "CREATE TRIGGER tickets_fts_ai AFTER INSERT ON tickets BEGIN "
+            "INSERT INTO tickets_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END"
+        ))
+    with Session(legacy) as db:
+        db.add(models.Organization(id="org", name="Org"))
+        db.add(models.Ticket(title="legacy ticket", assignee="alice", organization_id="org"))
+        db.commit()
+
+    search.install_search_index(legacy)
+
+    backend = search.get_search_backend("sqlite")
+    with Session(legacy) as db:
+        assert [t.title for t in db.scalars(backend.query("org", "legacy"))] == ["legacy ticket"]
+        db.add(models.Ticket(title="new ticket", assignee="alice", organization_id="org"))
+        db.commit()
+        assert [t.title for t in db.scalars(backend.query("org", "new"))] == ["new ticket"]
@@ -0,0 +1,69 @@
+import asyncio
+import uuid
+
+from fastmcp import Client
+
+import crud
+import mcp_server
+import schemas
+
+def add(org_id: str, assignee: str, status: str = "backlog"):
+    ticket = crud.create_ticket(schemas.TicketCreate(title=f"{assignee} {status}", assignee=assignee), org_id)
+    if status != "backlog":
+        crud.update_ticket_status(ticket.id, status, org_id)
+
+def test_counts_by_status_and_assignee(org_id):
+    for assignee, status in [("ada", "backlog"), ("ada", "done"), ("ada", "done"), ("grace", "in-progress"), ("grace", "done")]:
+        add(org_id, assignee, status)
+
+    assert crud.get_ticket_statistics(org_id) == {
+        "total_tickets": 5,
+        "status_distribution": {"backlog": 1, "done": 3, "in-progress": 1},
+        "assignee_distribution": {"ada": 3, "grace": 2},
+    }
+
+def test_counts_match_the_ticket_list(org_id):
+    for i in range(12):
+        add(org_id, f"member-{i % 4}", schemas.TICKET_STATUSES[i % len(schemas.TICKET_STATUSES)])
+    tickets = crud.get_tickets(org_id)
+
+    statistics = crud.get_ticket_statistics(org_id)
+
+    assert statistics["total_tickets"] == len(tickets)
+    for field, distribution in (("status", "status_distribution"), ("assignee", "assignee_distribution")):
+        expected = {}
+        for ticket in tickets:
+            expected[ticket[field]] = expected.get(ticket[field], 0) + 1
+        assert statistics[distribution] == expected
+
+def test_counts_only_the_organizations_own_tickets(org_id):
+    other_org = f"org-{uuid.uuid4()}"
+    crud.ensure_organization(other_org)
+    add(org_id, "ada", "done")
+    add(other_org, "grace", "done")
+    add(other_org, "grace")
+
+    assert crud.get_ticket_statistics(org_id)["total_tickets"] == 1
+    assert crud.get_ticket_statistics(other_org)["assignee_distribution"] == {"grace": 2}
+
+def test_empty_organization_has_no_counts(org_id):
+    assert crud.get_ticket_statistics(org_id) == {
+        "total_tickets": 0,
+        "status_distribution": {},
+        "assignee_distribution": {},
+    }
+
+def test_tool_adds_the_organization_id(org_id, monkeypatch):
+    monkeypatch.setattr(mcp_server, "get_organization_id_from_context", lambda: org_id)
+    add(org_id, "ada")
+
+    async def run():
+        async with Client(mcp_server.mcp) as client:
+            return (await client.call_tool("get_ticket_statistics", {})).data
+
+    assert asyncio.run(run()) == {
+        "total_tickets": 1,
+        "status_distribution": {"backlog": 1},
+        "assignee_distribution": {"ada": 1},
+        "organization_id": org_id,
+    }
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi.testclient import TestClient
+
+import token_cache
+from auth_executor import AuthExecutor
+from token_cache import CachingBearerAuthProvider, VerifiedTokenCache
+
+ISSUER = "https://issuer.example"
+AUDIENCE = "project-test-mcp"
+
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+PUBLIC_KEY_PEM = PRIVATE_KEY.public_key().public_bytes(
+    serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+).decode()
+
+def make_token(expires_in: float = 300.0, key=PRIVATE_KEY, **claims) -> str:
+    payload = {"sub": "client-1", "iss": ISSUER, "aud": AUDIENCE, "exp": int(time.time() + expires_in), **claims}
+    return jwt.encode(payload, key, algorithm="RS256")
+
+@pytest.fixture
+def provider():
+    return CachingBearerAuthProvider(public_key=PUBLIC_KEY_PEM, issuer=ISSUER, audience=AUDIENCE)
+
+def load(provider, token):
+    return asyncio.run(provider.load_access_token(token))
+
+def test_verified_token_is_served_from_the_cache(provider, monkeypatch):
+    token = make_token()
+    first = load(provider, token)
+    # A cache hit must not reach the signature check again
+    monkeypatch.setattr(
+        token_cache.BearerAuthProvider, "load_access_token", lambda *args: pytest.fail("token was re-verified")
+    )
+    second = load(provider, token)
+
+    assert first.client_id == "client-1"
+    assert second is first
+    assert provider.token_cache.stats() == {"size": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+def test_tokens_are_verified_inline_without_an_auth_pool(provider, monkeypatch):
+    monkeypatch.setattr(token_cache, "auth_executor", AuthExecutor(max_workers=0))
+
+    assert load(provider, make_token()).client_id == "client-1"
+
+def test_cached_token_expires_with_the_jwt(provider, monkeypatch):
+    token = make_token(expires_in=60)
+    assert load(provider, token) is not None
+
+    later = time.time() + 120
+    monkeypatch.setattr(token_cache, "time", SimpleNamespace(time=lambda: later))
+
+    assert provider.token_cache.get(token) is None
+    assert provider.token_cache.stats()["size"] == 0
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        make_token(expires_in=-60),
+        make_token(aud="another-project"),
+        make_token(iss="https://another-issuer.example"),
+        make_token(key=rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+        "not-a-jwt",
+    ],
+    ids=["expired", "audience", "issuer", "signature", "malformed"],
+)
+def test_invalid_tokens_are_rejected_and_not_cached(provider, token):
+    assert load(provider, token) is None
+    assert load(provider, token) is None
+    assert provider.token_cache.stats() == {"size": 0, "hits": 0, "misses": 2, "hit_rate": 0.0}
+
+def test_cache_evicts_the_least_recently_used_token():
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+def test_cache_stats_are_exposed():
+    from main import app
+
+    response = TestClient(app).get("/api/metrics")
+
+    assert response.status_code == 200
+    assert {"hits", "misses", "hit_rate", "size"} <= set(response.json()["mcp_token_cache"])
+    assert {"hits", "misses", "hit_rate", "size"} <= set(response.json()["session_jwt_cache"])
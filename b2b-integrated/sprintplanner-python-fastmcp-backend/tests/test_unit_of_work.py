@@ -0,0 +1,78 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import crud
+import schemas
+from database import engine, read_engine
+from main import app, verify_stytch_session
+from write_queue import write_queue
+
+@pytest.fixture
+def client(org_id):
+    app.dependency_overrides[verify_stytch_session] = lambda: {"organization_id": org_id}
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+@pytest.fixture
+def database_use():
+    """Connection checkouts per pool and commits on the write engine"""
+    counts = {"write": 0, "read": 0, "commits": 0}
+
+    def counter(key):
+        def count(*args):
+            counts[key] += 1
+        return count
+
+    listeners = [
+        (engine, "checkout", counter("write")),
+        (read_engine, "checkout", counter("read")),
+        (engine, "commit", counter("commits")),
+    ]
+    for target, name, listener in listeners:
+        event.listen(target, name, listener)
+    yield counts
+    for target, name, listener in listeners:
+        event.remove(target, name, listener)
+
+def test_write_request_runs_in_one_session_and_transaction(client, database_use):
+    response = client.post("/api/tickets", json={"title": "first", "assignee": "alice"})
+
+    assert response.status_code == 200
+    assert [t["title"] for t in response.json()["tickets"]] == ["first"]
+    # Org check, insert, version bump and relist share one connection and one commit
+    assert database_use == {"write": 1, "read": 0, "commits": 1}
+
+def test_status_and_delete_requests_run_in_one_transaction(client, org_id, database_use):
+    ticket = crud.create_ticket(schemas.TicketCreate(title="first", assignee="alice"), org_id)
+    database_use.update(write=0, read=0, commits=0)
+
+    response = client.post(f"/api/tickets/{ticket.id}/status", json={"status": "done"})
+    assert response.status_code == 200
+    assert response.json()["tickets"][0]["status"] == "done"
+
+    response = client.delete(f"/api/tickets/{ticket.id}")
+    assert response.status_code == 200
+    assert response.json()["tickets"] == []
+    assert database_use == {"write": 2, "read": 0, "commits": 2}
+
+def test_failed_write_request_commits_nothing(client, org_id, database_use):
+    version = crud.get_board_version(org_id)
+
+    response = client.delete("/api/tickets/missing")
+
+    assert response.status_code == 404
+    assert database_use["commits"] == 0
+    assert crud.get_board_version(org_id) == version
+
+def test_group_commit_takes_over_the_transaction(client, monkeypatch, database_use):
+    monkeypatch.setattr(write_queue, "max_batch", 8)
+    batches = write_queue.batches
+
+    response = client.post("/api/tickets", json={"title": "queued", "assignee": "alice"})
+
+    assert response.status_code == 200
+    assert [t["title"] for t in response.json()["tickets"]] == ["queued"]
+    assert write_queue.batches == batches + 1
@@ -0,0 +1,67 @@
+import asyncio
+
+import crud
+import events
+import list_cache
+import schemas
+from database import ReadSessionLocal
+from write_queue import WriteQueue
+
+def committed_version(org_id: str) -> int:
+    """Board version as another connection sees it"""
+    with ReadSessionLocal() as db:
+        return crud._board_version(db, org_id)
+
+def create(queue: WriteQueue, org_id: str, title: str):
+    return queue.submit(crud.with_board_version, org_id, crud.create_ticket, schemas.TicketCreate(title=title, assignee="alice"), org_id)
+
+def test_batch_publishes_only_committed_versions(org_id):
+    seen = []
+    unsubscribe = events.broker.subscribe(org_id, lambda event: seen.append((event.version, committed_version(org_id))))
+    queue = WriteQueue(max_batch=8, window_seconds=0.05)
+
+    async def run():
+        return await asyncio.gather(*(create(queue, org_id, f"t{i}") for i in range(4)))
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        unsubscribe()
+
+    assert queue.batches == 1
+    assert sorted(version for _, version in results) == [1, 2, 3, 4]
+    assert [version for version, _ in seen] == [1, 2, 3, 4]
+    # Every event is published after the batch commit, so readers already see its version
+    assert all(visible >= version for version, visible in seen)
+
+def test_failed_write_keeps_neighbours_callbacks(org_id, monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(list_cache.cache, "invalidate", lambda tenant: invalidated.append(tenant))
+    published = []
+    unsubscribe = events.broker.subscribe(org_id, published.append)
+    queue = WriteQueue(max_batch=8, window_seconds=0.05)
+
+    def create_then_fail():
+        crud.create_ticket(schemas.TicketCreate(title="doomed", assignee="alice"), org_id)
+        raise RuntimeError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            create(queue, org_id, "first"),
+            queue.submit(create_then_fail),
+            create(queue, org_id, "last"),
+            return_exceptions=True,
+        )
+
+    try:
+        first, failed, last = asyncio.run(run())
+    finally:
+        unsubscribe()
+
+    assert queue.batches == 1
+    assert isinstance(failed, RuntimeError)
+    assert (first[1], last[1]) == (1, 2)
+    assert [event.version for event in published] == [1, 2]
+    assert invalidated == [org_id, org_id]
+    assert committed_version(org_id) == 2
+    assert sorted(t["title"] for t in crud.get_tickets(org_id)) == ["first", "last"]
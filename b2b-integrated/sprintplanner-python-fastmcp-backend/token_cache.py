@@ -0,0 +1,89 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fastmcp.server.auth import BearerAuthProvider
+from mcp.server.auth.provider import AccessToken
+
+from auth_executor import auth_executor
+
+
+class VerifiedTokenCache:
+    """Bounded LRU cache of already-verified tokens and what they verified to.
+
+    Entries are keyed by a SHA-256 digest of the raw token (so bearer tokens are
+    never kept as dictionary keys) and are dropped at the given `expires_at`
+    (normally the token's `exp`) or after `ttl_seconds`, whichever comes first.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Any]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, token: str, value: Any, expires_at: Optional[float] = None) -> None:
+        deadline = time.time() + self.ttl_seconds
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+
+        key = self._key(token)
+        self._entries[key] = (deadline, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CachingBearerAuthProvider(BearerAuthProvider):
+    """BearerAuthProvider that skips signature verification for tokens it has already verified.
+
+    Tokens that do need verifying go through BearerAuthProvider.load_access_token
+    on the auth executor rather than on the event loop. `token_cache.stats()`
+    reports the hit rate.
+    """
+
+    def __init__(self, *args, cache_size: int = 1024, cache_ttl_seconds: float = 300.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.token_cache = VerifiedTokenCache(maxsize=cache_size, ttl_seconds=cache_ttl_seconds)
+
+    async def load_access_token(self, token: str) -> Optional[AccessToken]:
+        cached = self.token_cache.get(token)
+        if cached is not None:
+            return cached
+
+        access_token = await auth_executor.run_async(super().load_access_token(token))
+        if access_token is not None:
+            self.token_cache.put(token, access_token, access_token.expires_at)
+        return access_token
@@ -1,10 +1,12 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 from . import mcp_server
+from .db import init_db
 
 from .routes.health import router as health_router
 from .routes.todos import router as tasks_router
@@ -20,8 +22,21 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
-mcp_app = mcp_server.mcp.http_app(path="/")
-app = FastAPI(title="Tasklist Python Backend", lifespan=mcp_app.lifespan)
+mcp_app = mcp_server.mcp.http_app(path="/", stateless_http=mcp_server.STATELESS_HTTP)
+
+# The multi-worker launcher creates the schema once and sets this for its workers
+SKIP_SCHEMA_SETUP = os.getenv('SKIP_SCHEMA_SETUP', 'false').lower() in ('1', 'true', 'yes')
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Bootstrap the schema once per process; services assume it already exists
+    if not SKIP_SCHEMA_SETUP:
+        init_db()
+    # Run the MCP lifespan so the StreamableHTTP session manager is initialized
+    async with mcp_app.lifespan(app):
+        yield
+
+app = FastAPI(title="Tasklist Python Backend", lifespan=lifespan, default_response_class=ORJSONResponse)
 app.mount("/mcp", mcp_app)
 
 app.add_middleware(
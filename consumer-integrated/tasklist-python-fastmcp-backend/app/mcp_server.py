@@ -1,10 +1,11 @@
 import os
 from fastmcp import FastMCP
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
-from .services.todos import TodoService, Task
-from fastmcp.server.auth import BearerAuthProvider
+from . import events, pagination
+from .services.todos import TodoService, Task, TaskBatchResult, TaskChange
+from .token_cache import CachingBearerAuthProvider
 from fastmcp.server.dependencies import get_access_token
 from dotenv import load_dotenv
 
@@ -15,8 +16,15 @@ load_dotenv('.env.local')
 STYTCH_DOMAIN = os.getenv('STYTCH_DOMAIN')
 STYTCH_PROJECT_ID = os.getenv('STYTCH_PROJECT_ID')
 PUBLIC_BASE_URL = os.getenv('PUBLIC_BASE_URL', 'http://localhost:3001')
+# Upper bound on the number of items a single batch tool call may carry
+MAX_BATCH_SIZE = int(os.getenv('MCP_MAX_BATCH_SIZE', '100'))
+# Stateless transport: every MCP request stands alone (no Mcp-Session-Id), so
+# requests can land on any worker or node. Resource subscriptions need a
+# session and are not offered in this mode.
+STATELESS_HTTP = os.getenv('MCP_STATELESS_HTTP', 'false').lower() in ('1', 'true', 'yes')
 
-auth = BearerAuthProvider(
+# Verified tokens are cached so repeat tool calls skip RS256 verification
+auth = CachingBearerAuthProvider(
     jwks_uri=f"{STYTCH_DOMAIN}/.well-known/jwks.json",
     issuer=STYTCH_DOMAIN,
     algorithm="RS256",
@@ -37,9 +45,24 @@ def _get_user_id_from_token() -> str:
 
     return token.claims.get("sub")
 
+# Subscribed sessions get `resources/updated` for their resource://tasks URIs after every task write
+resource_subscriptions = events.ResourceSubscriptions(events.broker)
+if not STATELESS_HTTP:
+    resource_subscriptions.install(mcp, _get_user_id_from_token)
+
+def _check_batch_size(items: List[str]) -> None:
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} items can be sent in one batch")
+
 class TasksResponse(BaseModel):
     tasks: List[Task]
 
+class TasksPage(TasksResponse):
+    # Set when more tasks are available
+    nextCursor: Optional[str] = None
+    # It changes whenever the user's tasks change
+    version: int
+
 @mcp.tool()
 async def createTask(taskText: str) -> TasksResponse:
     user_id = _get_user_id_from_token()
@@ -61,12 +84,60 @@ async def deleteTask(taskID: str) -> TasksResponse:
     todos = await service.delete(taskID)
     return TasksResponse(tasks=todos)
 
-@mcp.resource("resource://tasks")
-async def tasks() -> TasksResponse:
+# Delta variants return only the changed task and the user's new list version
+# instead of the whole task list
+
+@mcp.tool()
+async def createTaskDelta(taskText: str) -> TaskChange:
+    user_id = _get_user_id_from_token()
+    return await TodoService(user_id).add_delta(taskText)
+
+@mcp.tool()
+async def markTaskCompleteDelta(taskID: str) -> TaskChange:
+    user_id = _get_user_id_from_token()
+    return await TodoService(user_id).mark_completed_delta(taskID)
+
+@mcp.tool()
+async def deleteTaskDelta(taskID: str) -> TaskChange:
+    user_id = _get_user_id_from_token()
+    return await TodoService(user_id).delete_delta(taskID)
+
+@mcp.tool()
+async def bulkCreateTasks(taskTexts: List[str]) -> TaskBatchResult:
+    _check_batch_size(taskTexts)
+    user_id = _get_user_id_from_token()
+    return await TodoService(user_id).add_many(taskTexts)
+
+@mcp.tool()
+async def bulkCompleteTasks(taskIDs: List[str]) -> TaskBatchResult:
+    _check_batch_size(taskIDs)
+    user_id = _get_user_id_from_token()
+    return await TodoService(user_id).mark_completed_many(taskIDs)
+
+@mcp.tool()
+async def bulkDeleteTasks(taskIDs: List[str]) -> TaskBatchResult:
+    _check_batch_size(taskIDs)
+    user_id = _get_user_id_from_token()
+    return await TodoService(user_id).delete_many(taskIDs)
+
+async def _tasks_page(cursor: Optional[str] = None) -> TasksPage:
     user_id = _get_user_id_from_token()
     service = TodoService(user_id)
-    todos = await service.get()
-    return TasksResponse(tasks=todos)
+    after = pagination.decode_cursor(cursor) if cursor else None
+    todos, next_key, version = await service.get_page(pagination.DEFAULT_PAGE_SIZE, after)
+    return TasksPage(
+        tasks=todos,
+        nextCursor=pagination.encode_cursor(*next_key) if next_key else None,
+        version=version,
+    )
+
+@mcp.resource("resource://tasks")
+async def tasks() -> TasksPage:
+    return await _tasks_page()
+
+@mcp.resource("resource://tasks/page/{cursor}")
+async def tasks_page(cursor: str) -> TasksPage:
+    return await _tasks_page(cursor)
 
 @mcp.resource("resource://tasks/{task_id}")
 async def task(task_id: str) -> TasksResponse:
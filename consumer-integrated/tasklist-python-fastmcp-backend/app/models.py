@@ -1,12 +1,30 @@
-from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy import Column, String, Integer, DateTime, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 from .db import Base
+from .ids import generate_id
+
+# SQLite's CURRENT_TIMESTAMP has second resolution; bind datetimes in the same format
+# so keyset comparisons against server-generated timestamps line up with stored text
+Timestamp = DateTime(timezone=True).with_variant(sqlite.DATETIME(truncate_microseconds=True), 'sqlite')
 
 class TaskORM(Base):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # Lists are read per user in (completed, created_at, id) order, and pages resume
+        # from that key: the index serves both without sorting the user's tasks
+        Index('ix_tasks_user_completed_created_id', 'user_id', 'completed', 'created_at', 'id'),
+    )
 
-    id = Column(String, primary_key=True)
-    user_id = Column(String, nullable=False, index=True)
+    id = Column(String, primary_key=True, default=generate_id)
+    user_id = Column(String, nullable=False)
     text = Column(String, nullable=False)
     completed = Column(Integer, nullable=False, default=0)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+
+class TaskListVersionORM(Base):
+    """Per-user write counter, bumped in the same transaction as every task mutation"""
+    __tablename__ = 'task_list_versions'
+
+    user_id = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
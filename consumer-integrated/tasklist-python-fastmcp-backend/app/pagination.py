@@ -0,0 +1,25 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+def encode_cursor(completed: int, created_at: datetime, task_id: str) -> str:
+    """Encode the sort key of the last task on a page as an opaque cursor"""
+    payload = json.dumps([completed, created_at.isoformat(), task_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[int, datetime, str]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        completed, created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        return int(completed), datetime.fromisoformat(created_at), str(task_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
@@ -1,6 +1,12 @@
 from fastapi import APIRouter
 import os
 
+from .. import list_cache
+from ..auth_executor import auth_executor
+from ..mcp_server import auth as mcp_auth
+from ..security import get_verifier
+from ..write_queue import write_queue
+
 router = APIRouter()
 
 @router.get('/healthcheck')
@@ -32,3 +38,14 @@ def healthcheck():
         }
 
     return {'status': 'ok', 'message': 'All environment variables are configured correctly'}
+
+@router.get('/metrics')
+def metrics():
+    """Counters of this worker's caches and queues, for dashboards and tuning"""
+    return {
+        'mcp_token_cache': mcp_auth.token_cache.stats(),
+        'session_jwt_cache': get_verifier().cache.stats(),
+        'auth_executor': auth_executor.stats(),
+        'write_queue': write_queue.stats(),
+        'list_cache': list_cache.cache.stats(),
+    }
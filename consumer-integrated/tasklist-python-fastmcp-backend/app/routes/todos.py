@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, Request
-from pydantic import BaseModel
-from typing import List
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import List, Union
 
-from ..services.todos import TodoService, Task
+from .. import etags, events, ndjson
+from ..services.todos import TodoService, Task, TaskChange
 
 router = APIRouter()
 
@@ -12,26 +14,111 @@ class TasksResponse(BaseModel):
 class CreateTaskBody(BaseModel):
     taskText: str
 
+class ImportTaskLine(BaseModel):
+    taskText: str
+    completed: bool = False
+
+class ImportLineError(BaseModel):
+    line: int
+    error: str
+
+class ImportResponse(BaseModel):
+    created: int
+    failed: int
+    # At most the first IMPORT_MAX_ERRORS rejected lines
+    errors: List[ImportLineError]
+
+# Tasks are inserted (and committed) in chunks as the request body streams in
+IMPORT_CHUNK_SIZE = 500
+IMPORT_MAX_ERRORS = 100
+
+def _wants_delta(request: Request) -> bool:
+    """Clients opt into delta responses with `?return=delta` or `Prefer: return=minimal`"""
+    if request.query_params.get('return') == 'delta':
+        return True
+    return 'return=minimal' in request.headers.get('prefer', '')
+
 @router.get('/tasks', response_model=TasksResponse)
-async def get_tasks(request: Request):
+async def get_tasks(request: Request, response: Response):
+    """The user's tasks, with an ETag of the list version; If-None-Match gets a 304 while unchanged"""
     user_id = request.state.user.user_id  # type: ignore[attr-defined]
-    todos = await TodoService(user_id).get()
+    service = TodoService(user_id)
+    # Read the version before the list: the list can only be newer than its ETag, never staler
+    etag = etags.make_etag(user_id, await service.get_version())
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if etags.if_none_match(request, etag):
+        return Response(status_code=304, headers=headers)
+    todos = await service.get()
+    response.headers.update(headers)
     return { 'tasks': todos }
 
-@router.post('/tasks', response_model=TasksResponse)
+@router.post('/tasks', response_model=Union[TasksResponse, TaskChange])
 async def create_task(body: CreateTaskBody, request: Request):
     user_id = request.state.user.user_id  # type: ignore[attr-defined]
+    if _wants_delta(request):
+        return await TodoService(user_id).add_delta(body.taskText)
     todos = await TodoService(user_id).add(body.taskText)
     return { 'tasks': todos }
 
-@router.post('/tasks/{task_id}/complete', response_model=TasksResponse)
+@router.post('/tasks/{task_id}/complete', response_model=Union[TasksResponse, TaskChange])
 async def complete_task(task_id: str, request: Request):
     user_id = request.state.user.user_id  # type: ignore[attr-defined]
+    if _wants_delta(request):
+        return await TodoService(user_id).mark_completed_delta(task_id)
     todos = await TodoService(user_id).mark_completed(task_id)
     return { 'tasks': todos }
 
-@router.delete('/tasks/{task_id}', response_model=TasksResponse)
+@router.delete('/tasks/{task_id}', response_model=Union[TasksResponse, TaskChange])
 async def delete_task(task_id: str, request: Request):
     user_id = request.state.user.user_id  # type: ignore[attr-defined]
+    if _wants_delta(request):
+        return await TodoService(user_id).delete_delta(task_id)
     todos = await TodoService(user_id).delete(task_id)
     return { 'tasks': todos }
+
+@router.post('/tasks:bulk', response_model=ImportResponse)
+async def import_tasks(request: Request):
+    """Bulk-create tasks from an NDJSON body of `{"taskText": ..., "completed": ...}` lines.
+
+    A line longer than `ndjson.MAX_LINE_BYTES` stops the import with a 413 whose body still
+    reports `created`, `failed` and `errors`: tasks from the lines before it are kept.
+    """
+    user_id = request.state.user.user_id  # type: ignore[attr-defined]
+    service = TodoService(user_id)
+    created, failed, errors, chunk = 0, 0, [], []
+    try:
+        async for line_number, line in ndjson.iter_lines(request.stream()):
+            try:
+                item = ImportTaskLine.model_validate_json(line)
+            except ValidationError as e:
+                failed += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append(ImportLineError(line=line_number, error=str(e)))
+                continue
+            chunk.append((item.taskText, item.completed))
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                created += await service.import_tasks(chunk)
+                chunk = []
+    except ndjson.LineTooLongError as e:
+        # Earlier chunks are already committed, so report them rather than fail the whole import
+        created += await service.import_tasks(chunk)
+        result = ImportResponse(created=created, failed=failed, errors=errors)
+        return JSONResponse(status_code=413, content={**result.model_dump(), 'detail': str(e)})
+    created += await service.import_tasks(chunk)
+    return { 'created': created, 'failed': failed, 'errors': errors }
+
+@router.get('/tasks/export')
+async def export_tasks(request: Request):
+    user_id = request.state.user.user_id  # type: ignore[attr-defined]
+    batches = TodoService(user_id).iter_batches()
+    return StreamingResponse(ndjson.stream_batches(batches, Task.model_dump), media_type=ndjson.NDJSON_MEDIA_TYPE)
+
+@router.get('/tasks/stream')
+async def stream_task_changes(request: Request):
+    """Server-Sent Events feed of the user's task changes (resumable with Last-Event-ID)"""
+    user_id = request.state.user.user_id  # type: ignore[attr-defined]
+    return StreamingResponse(
+        events.change_stream(events.broker, user_id, TodoService(user_id).get_version, request.headers.get('last-event-id')),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
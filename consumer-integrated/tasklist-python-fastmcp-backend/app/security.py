@@ -1,12 +1,25 @@
+import asyncio
 import os
+from dataclasses import dataclass
 from typing import Any, Dict
 from fastapi import HTTPException, Request
 from stytch import Client
 from dotenv import load_dotenv
 
+from .jwks import SessionJWTVerifier
+
 load_dotenv('.env.local')
 
+SESSION_CLAIM = 'https://stytch.com/session'
+
 _client: Client | None = None
+_verifier: SessionJWTVerifier | None = None
+
+@dataclass
+class LocalSession:
+    """The subset of a Stytch session that is available from a locally verified session JWT"""
+    user_id: str
+    session_id: str | None = None
 
 def get_client() -> Client:
     global _client
@@ -21,14 +34,34 @@ def get_client() -> Client:
         )
     return _client
 
+def get_verifier() -> SessionJWTVerifier:
+    global _verifier
+    if _verifier is None:
+        project_id = os.environ.get('STYTCH_PROJECT_ID')
+        stytch_domain = os.environ.get('STYTCH_DOMAIN')
+        _verifier = SessionJWTVerifier(
+            project_id=project_id,
+            jwks_uri=f"{stytch_domain}/v1/sessions/jwks/{project_id}",
+            issuers=[f"stytch.com/{project_id}", stytch_domain],
+        )
+    return _verifier
+
 async def authorize_session(request: Request) -> Dict[str, Any]:
     try:
         session_jwt = request.cookies.get('stytch_session_jwt')
         if not session_jwt:
             raise HTTPException(status_code=401, detail='Unauthorized')
-        client = get_client()
-        auth = client.sessions.authenticate_jwt(session_jwt=session_jwt)
-        request.state.user = auth.session
-        return {"user": auth.session}
+
+        claims = await get_verifier().verify(session_jwt)
+        if claims is not None:
+            session = LocalSession(user_id=claims['sub'], session_id=claims.get(SESSION_CLAIM, {}).get('id'))
+        else:
+            # Unknown signing key or JWT near expiry: let Stytch decide, off the event loop
+            client = get_client()
+            auth = await asyncio.to_thread(client.sessions.authenticate, session_jwt=session_jwt)
+            session = auth.session
+
+        request.state.user = session
+        return {"user": session}
     except Exception:
         raise HTTPException(status_code=401, detail='Unauthorized')
@@ -1,52 +1,319 @@
+import functools
+import json
+from datetime import datetime
 from pydantic import BaseModel
-from typing import List, Optional
-from sqlalchemy import select, update, delete
-from ..db import SessionLocal, init_db
-from ..models import TaskORM
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+from sqlalchemy import bindparam, select, update, delete, tuple_
+from sqlalchemy.orm import Session
+from ..db import ReadSessionLocal, SessionLocal, on_commit, run_db, session_scope, upsert_insert
+from .. import events, list_cache
+from ..write_queue import write_queue
+from ..ids import generate_id
+from ..models import TaskORM, TaskListVersionORM
+
+# Lists are ordered by creation time, not by ID: IDs minted before UUIDv7 were
+# decimal millisecond timestamps, which sort after every UUIDv7 string
+TASK_ORDER = (TaskORM.completed, TaskORM.created_at, TaskORM.id)
+PageKey = Tuple[int, datetime, str]
 
 class Task(BaseModel):
     id: str
     text: str
     completed: bool
 
+class TaskChange(BaseModel):
+    """Result of a single mutation: the affected task plus the user's new list version"""
+    task: Optional[Task] = None
+    deletedId: Optional[str] = None
+    version: int
+
+class TaskBatchItem(BaseModel):
+    """Outcome of one item of a batch mutation"""
+    taskID: Optional[str] = None
+    ok: bool
+    task: Optional[Task] = None
+    error: Optional[str] = None
+
+class TaskBatchResult(BaseModel):
+    """Per-item results of a batch mutation, in input order, plus the user's new list version"""
+    results: List[TaskBatchItem]
+    version: int
+
 class TodoService:
+    """Lightweight per-request handle over the shared task store.
+
+    The schema is created once at application startup (see `init_db`), so
+    constructing a service per request or tool call is cheap.
+
+    Each mutation comes in two flavours: `add`/`delete`/`mark_completed` return
+    the user's full task list, while the `*_delta` variants return only a
+    `TaskChange` and skip the list reload. The `*_many` variants apply a whole
+    batch in one transaction and return a `TaskBatchResult`.
+
+    List reads run on the read-only connection pool (`ReadSessionLocal`) and go
+    through `list_cache`, checked against the user's list version.
+    """
+
     def __init__(self, user_id: str):
         self.user_id = user_id
-        init_db()
 
     def _to_model(self, orm: TaskORM) -> Task:
         return Task(id=orm.id, text=orm.text, completed=bool(orm.completed))
 
+    # Read-only lists select these columns as plain rows; ORM instances are only built for writes
+    _columns = (TaskORM.id, TaskORM.text, TaskORM.completed)
+
+    @staticmethod
+    def _row_to_dict(row) -> dict:
+        return {'id': row.id, 'text': row.text, 'completed': bool(row.completed)}
+
     async def get(self) -> List[Task]:
-        with SessionLocal() as session:
-            stmt = select(TaskORM).where(TaskORM.user_id == self.user_id).order_by(TaskORM.completed.asc(), TaskORM.id.asc())
-            rows = session.execute(stmt).scalars().all()
-            return [self._to_model(row) for row in rows]
+        return await run_db(self._get)
+
+    async def get_page(self, limit: int, after: Optional[PageKey] = None) -> Tuple[List[Task], Optional[PageKey], int]:
+        """One page of tasks ordered by (completed, created_at, id), the key to resume after (None on the
+        last page) and the list version the page was read at"""
+        return await run_db(self._get_page, limit, after)
+
+    async def get_version(self) -> int:
+        """The user's list version, bumped by every committed mutation"""
+        return await run_db(self._get_version)
 
     async def get_by_id(self, todo_id: str) -> Optional[Task]:
-        with SessionLocal() as session:
+        return await run_db(self._get_by_id, todo_id)
+
+    # Single-task mutations go through the write queue, which can group-commit them
+
+    async def add(self, todo_text: str) -> List[Task]:
+        await self.add_delta(todo_text)
+        return await self.get()
+
+    async def delete(self, todo_id: str) -> List[Task]:
+        await self.delete_delta(todo_id)
+        return await self.get()
+
+    async def mark_completed(self, todo_id: str) -> List[Task]:
+        await self.mark_completed_delta(todo_id)
+        return await self.get()
+
+    async def add_delta(self, todo_text: str) -> TaskChange:
+        return await write_queue.submit(self._add_delta, todo_text)
+
+    async def delete_delta(self, todo_id: str) -> TaskChange:
+        return await write_queue.submit(self._delete_delta, todo_id)
+
+    async def mark_completed_delta(self, todo_id: str) -> TaskChange:
+        return await write_queue.submit(self._mark_completed_delta, todo_id)
+
+    async def import_tasks(self, tasks: List[Tuple[str, bool]]) -> int:
+        """Insert a chunk of imported (text, completed) tasks in one transaction; returns the number inserted"""
+        return await run_db(self._import_tasks, tasks)
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[Task]]:
+        """Blocking iterator over all of the user's tasks, `batch_size` at a time, read
+        through a server-side cursor. Advance it on the DB executor (see `ndjson.stream_batches`);
+        it opens its own session since each batch may be fetched from a different thread.
+        """
+        stmt = (
+            select(TaskORM.id, TaskORM.text, TaskORM.completed)
+            .where(TaskORM.user_id == self.user_id)
+            .order_by(*TASK_ORDER)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        with ReadSessionLocal() as session:
+            for partition in session.execute(stmt).partitions():
+                yield [Task(id=row.id, text=row.text, completed=bool(row.completed)) for row in partition]
+
+    async def add_many(self, todo_texts: List[str]) -> TaskBatchResult:
+        return await run_db(self._add_many, todo_texts)
+
+    async def delete_many(self, todo_ids: List[str]) -> TaskBatchResult:
+        return await run_db(self._delete_many, todo_ids)
+
+    async def mark_completed_many(self, todo_ids: List[str]) -> TaskBatchResult:
+        return await run_db(self._mark_completed_many, todo_ids)
+
+    # Blocking implementations, executed on the DB executor
+
+    def _read_through(self, session: Session, view: str, load: Callable[[], Any]) -> Tuple[Any, int]:
+        """Serve a JSON-ready view from the list cache if the list version is unchanged,
+        returning it with that version.
+
+        Only used in read-only sessions, so whatever is loaded is already committed.
+        """
+        version = self._current_version(session)
+        value = list_cache.cache.get(self.user_id, view, version)
+        if value is None:
+            value = load()
+            list_cache.cache.put(self.user_id, view, version, value)
+        return value, version
+
+    def _get(self) -> List[Task]:
+        with ReadSessionLocal() as session:
+            def load():
+                stmt = select(*self._columns).where(TaskORM.user_id == self.user_id).order_by(*TASK_ORDER)
+                return [self._row_to_dict(row) for row in session.execute(stmt)]
+
+            tasks, _ = self._read_through(session, 'tasks', load)
+            return [Task(**task) for task in tasks]
+
+    def _get_version(self) -> int:
+        with ReadSessionLocal() as session:
+            return self._current_version(session)
+
+    def _get_page(self, limit: int, after: Optional[PageKey]) -> Tuple[List[Task], Optional[PageKey], int]:
+        after_json = [after[0], after[1].isoformat(), after[2]] if after else None
+        with ReadSessionLocal() as session:
+            def load():
+                stmt = select(*self._columns, TaskORM.created_at).where(TaskORM.user_id == self.user_id)
+                if after:
+                    stmt = stmt.where(tuple_(*TASK_ORDER) > after)
+                stmt = stmt.order_by(*TASK_ORDER).limit(limit + 1)
+                rows = session.execute(stmt).all()
+
+                next_key = None
+                if len(rows) > limit:
+                    rows = rows[:limit]
+                    next_key = [rows[-1].completed, rows[-1].created_at.isoformat(), rows[-1].id]
+                return {'tasks': [self._row_to_dict(row) for row in rows], 'nextKey': next_key}
+
+            page, version = self._read_through(session, f"page:{limit}:{json.dumps(after_json)}", load)
+            next_key = page['nextKey']
+            if next_key:
+                next_key = (next_key[0], datetime.fromisoformat(next_key[1]), next_key[2])
+            return [Task(**task) for task in page['tasks']], next_key, version
+
+    def _get_by_id(self, todo_id: str) -> Optional[Task]:
+        with ReadSessionLocal() as session:
             stmt = select(TaskORM).where(TaskORM.id == todo_id, TaskORM.user_id == self.user_id)
             row = session.execute(stmt).scalar_one_or_none()
             return self._to_model(row) if row else None
 
-    async def add(self, todo_text: str) -> List[Task]:
-        with SessionLocal() as session:
-            new_id = str(int(__import__('time').time() * 1000))
-            todo = TaskORM(id=new_id, user_id=self.user_id, text=todo_text, completed=0)
+    def _bump_version(self, session: Session, op: str, ids: List[str]) -> int:
+        """Bump the list version for a write of `op` ("created", "updated", ...) on tasks `ids`"""
+        stmt = upsert_insert(session, TaskListVersionORM.__table__).values(user_id=self.user_id, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TaskListVersionORM.user_id],
+            set_={'version': TaskListVersionORM.version + 1},
+        ).returning(TaskListVersionORM.version)
+        version = session.execute(stmt).scalar_one()
+        # Once the write commits, cached lists of this user are stale and subscribers are told
+        on_commit(session, functools.partial(list_cache.cache.invalidate, self.user_id))
+        on_commit(session, functools.partial(events.broker.publish, events.ChangeEvent(self.user_id, version, op, ids)))
+        return version
+
+    def _current_version(self, session: Session) -> int:
+        stmt = select(TaskListVersionORM.version).where(TaskListVersionORM.user_id == self.user_id)
+        return session.execute(stmt).scalar_one_or_none() or 0
+
+    def _add_delta(self, todo_text: str) -> TaskChange:
+        with session_scope() as session:
+            todo = TaskORM(id=generate_id(), user_id=self.user_id, text=todo_text, completed=0)
             session.add(todo)
-            session.commit()
-            return await self.get()
+            session.flush()
+            task = self._to_model(todo)
+            version = self._bump_version(session, 'created', [todo.id])
+            return TaskChange(task=task, version=version)
 
-    async def delete(self, todo_id: str) -> List[Task]:
-        with SessionLocal() as session:
+    def _delete_delta(self, todo_id: str) -> TaskChange:
+        with session_scope() as session:
             stmt = delete(TaskORM).where(TaskORM.id == todo_id, TaskORM.user_id == self.user_id)
-            session.execute(stmt)
+            if session.execute(stmt).rowcount == 0:
+                return TaskChange(version=self._current_version(session))
+            version = self._bump_version(session, 'deleted', [todo_id])
+            return TaskChange(deletedId=todo_id, version=version)
+
+    def _mark_completed_delta(self, todo_id: str) -> TaskChange:
+        with session_scope() as session:
+            stmt = (
+                update(TaskORM)
+                .where(TaskORM.id == todo_id, TaskORM.user_id == self.user_id)
+                .values(completed=1)
+                .returning(TaskORM.id, TaskORM.text, TaskORM.completed)
+            )
+            row = session.execute(stmt).first()
+            if row is None:
+                return TaskChange(version=self._current_version(session))
+            version = self._bump_version(session, 'updated', [row.id])
+            return TaskChange(task=Task(id=row.id, text=row.text, completed=bool(row.completed)), version=version)
+
+    def _import_tasks(self, tasks: List[Tuple[str, bool]]) -> int:
+        if not tasks:
+            return 0
+        rows = [
+            {'id': generate_id(), 'user_id': self.user_id, 'text': text, 'completed': int(completed)}
+            for text, completed in tasks
+        ]
+        with SessionLocal() as session:
+            session.execute(TaskORM.__table__.insert(), rows)
+            self._bump_version(session, 'imported', [row['id'] for row in rows])
             session.commit()
-            return await self.get()
+        return len(rows)
 
-    async def mark_completed(self, todo_id: str) -> List[Task]:
+    def _add_many(self, todo_texts: List[str]) -> TaskBatchResult:
+        rows = [
+            {'id': generate_id(), 'user_id': self.user_id, 'text': text, 'completed': 0}
+            for text in todo_texts
+        ]
         with SessionLocal() as session:
-            stmt = update(TaskORM).where(TaskORM.id == todo_id, TaskORM.user_id == self.user_id).values(completed=1)
-            session.execute(stmt)
+            if not rows:
+                return TaskBatchResult(results=[], version=self._current_version(session))
+            # One executemany INSERT for the whole batch
+            session.execute(TaskORM.__table__.insert(), rows)
+            version = self._bump_version(session, 'created', [row['id'] for row in rows])
             session.commit()
-            return await self.get()
+        results = [
+            TaskBatchItem(taskID=row['id'], ok=True, task=Task(id=row['id'], text=row['text'], completed=False))
+            for row in rows
+        ]
+        return TaskBatchResult(results=results, version=version)
+
+    def _delete_many(self, todo_ids: List[str]) -> TaskBatchResult:
+        with SessionLocal() as session:
+            stmt = (
+                delete(TaskORM)
+                .where(TaskORM.user_id == self.user_id, TaskORM.id.in_(todo_ids))
+                .returning(TaskORM.id)
+            )
+            deleted = set(session.execute(stmt).scalars())
+            if deleted:
+                version = self._bump_version(session, 'deleted', sorted(deleted))
+                session.commit()
+            else:
+                version = self._current_version(session)
+        results = [
+            TaskBatchItem(taskID=todo_id, ok=True) if todo_id in deleted
+            else TaskBatchItem(taskID=todo_id, ok=False, error='Task not found')
+            for todo_id in todo_ids
+        ]
+        return TaskBatchResult(results=results, version=version)
+
+    def _mark_completed_many(self, todo_ids: List[str]) -> TaskBatchResult:
+        with SessionLocal() as session:
+            existing = set(session.execute(
+                select(TaskORM.id).where(TaskORM.user_id == self.user_id, TaskORM.id.in_(todo_ids))
+            ).scalars())
+            if not existing:
+                version = self._current_version(session)
+                updated = {}
+            else:
+                table = TaskORM.__table__
+                # One executemany UPDATE keyed by task ID
+                session.execute(
+                    update(table)
+                    .where(table.c.id == bindparam('task_id'), table.c.user_id == self.user_id)
+                    .values(completed=1),
+                    [{'task_id': todo_id} for todo_id in existing],
+                )
+                version = self._bump_version(session, 'updated', sorted(existing))
+                rows = session.execute(
+                    select(TaskORM.id, TaskORM.text, TaskORM.completed).where(TaskORM.id.in_(existing))
+                ).all()
+                session.commit()
+                updated = {row.id: Task(id=row.id, text=row.text, completed=bool(row.completed)) for row in rows}
+        results = [
+            TaskBatchItem(taskID=todo_id, ok=True, task=updated[todo_id]) if todo_id in updated
+            else TaskBatchItem(taskID=todo_id, ok=False, error='Task not found')
+            for todo_id in todo_ids
+        ]
+        return TaskBatchResult(results=results, version=version)
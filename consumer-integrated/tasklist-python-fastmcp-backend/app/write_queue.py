@@ -0,0 +1,134 @@
+import asyncio
+import contextvars
+import logging
+import os
+from typing import Any, Callable, List, Optional, Tuple
+
+from .db import in_transaction, run_db, transaction
+
+logger = logging.getLogger(__name__)
+
+# (fn, args, kwargs, future of the caller)
+_Write = Tuple[Callable[..., Any], tuple, dict, "asyncio.Future[Any]"]
+
+def _run_in_transaction(fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+    with transaction():
+        return fn(*args, **kwargs)
+
+class WriteQueue:
+    """Optional group commit for single-task writes.
+
+    `submit(fn, *args)` runs a blocking service call in a transaction and returns its
+    result. With WRITE_QUEUE_MAX_BATCH > 1, calls arriving within WRITE_QUEUE_WINDOW_MS
+    of each other are applied in submission order in one transaction, each inside its
+    own savepoint, and committed together. A failing call rolls back only its own
+    savepoint and raises in its caller.
+    """
+
+    def __init__(self, max_batch: int = 1, window_seconds: float = 0.002):
+        self.max_batch = max_batch
+        self.window_seconds = window_seconds
+        self._queue: Optional["asyncio.Queue[_Write]"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Committed batches and the writes in them, for tuning the window
+        self.batches = 0
+        self.writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_batch > 1
+
+    async def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `fn(*args, **kwargs)` in a transaction (shared with other queued writes) and return its result.
+
+        Inside a `transaction` block the call joins that transaction directly instead.
+        """
+        if not self.enabled or in_transaction():
+            return await run_db(_run_in_transaction, fn, args, kwargs)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._start(loop)
+        future = loop.create_future()
+        self._queue.put_nowait((fn, args, kwargs, future))
+        return await future
+
+    def stats(self) -> dict:
+        """Queue depth is the number of submitted writes waiting for the next batch"""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "writes": self.writes,
+            "avg_batch": self.writes / self.batches if self.batches else 0.0,
+        }
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        # Start from an empty context so the worker never inherits a caller's transaction
+        contextvars.Context().run(loop.create_task, self._worker(self._queue))
+
+    async def _worker(self, queue: "asyncio.Queue[_Write]") -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.window_seconds
+            while len(batch) < self.max_batch:
+                if queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(queue.get_nowait())
+
+            try:
+                outcomes = await run_db(self._apply, batch)
+            except Exception as e:
+                # The commit itself failed: none of the batch was written
+                logger.exception("Write batch of %d failed to commit", len(batch))
+                outcomes = [(False, e)] * len(batch)
+            else:
+                self.batches += 1
+                self.writes += len(batch)
+            for (_, _, _, future), (ok, value) in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    @staticmethod
+    def _apply(batch: List[_Write]) -> List[Tuple[bool, Any]]:
+        outcomes: List[Tuple[bool, Any]] = []
+        with transaction() as db:
+            if db.get_bind().dialect.name == "sqlite":
+                # pysqlite does not BEGIN before a SAVEPOINT, and releasing an outermost
+                # savepoint would commit; open the transaction (and take the write lock) here
+                db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+            for fn, args, kwargs, _ in batch:
+                try:
+                    # Rolling back the savepoint also drops its write's on_commit callbacks;
+                    # the others run once the whole batch has committed
+                    with db.begin_nested():
+                        result = fn(*args, **kwargs)
+                    outcomes.append((True, result))
+                except Exception as e:
+                    outcomes.append((False, e))
+                finally:
+                    # Each caller keeps the objects as its own write left them, even if a
+                    # later write in the batch touches the same rows
+                    db.expunge_all()
+        return outcomes
+
+def queue_from_env() -> WriteQueue:
+    """Group commit is off unless WRITE_QUEUE_MAX_BATCH is set above 1"""
+    return WriteQueue(
+        max_batch=int(os.getenv("WRITE_QUEUE_MAX_BATCH", "1")),
+        window_seconds=float(os.getenv("WRITE_QUEUE_WINDOW_MS", "2")) / 1000,
+    )
+
+write_queue = queue_from_env()
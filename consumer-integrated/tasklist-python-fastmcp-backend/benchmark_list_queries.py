@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compare ORM hydration against plain column rows for the task list query
+
+Seeds a throwaway SQLite database with N tasks for one user, then times
+`select(TaskORM)` against the column select used by `TodoService._get`,
+reporting wall time and peak allocation of each.
+
+    python benchmark_list_queries.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app.ids import generate_id
+from app.models import TaskORM
+from app.services.todos import TodoService
+
+USER_ID = 'user-benchmark'
+
+def seed(engine, rows: int) -> None:
+    with Session(engine) as session:
+        session.execute(
+            insert(TaskORM),
+            [{'id': generate_id(), 'user_id': USER_ID, 'text': f"Task {i}", 'completed': i % 3 == 0} for i in range(rows)],
+        )
+        session.commit()
+
+def orm_objects(engine) -> list:
+    service = TodoService(USER_ID)
+    with Session(engine) as session:
+        stmt = select(TaskORM).where(TaskORM.user_id == USER_ID).order_by(TaskORM.completed.asc(), TaskORM.id.asc())
+        return [service._to_model(row).model_dump() for row in session.execute(stmt).scalars()]
+
+def column_rows(engine) -> list:
+    with Session(engine) as session:
+        stmt = select(*TodoService._columns).where(TaskORM.user_id == USER_ID).order_by(TaskORM.completed.asc(), TaskORM.id.asc())
+        return [TodoService._row_to_dict(row) for row in session.execute(stmt)]
+
+def measure(fn, engine, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(engine)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn(engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'benchmark.db')}")
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.rows)
+
+        print(f"{args.rows} tasks, median of {args.repeat} runs")
+        for name, fn in (('ORM objects', orm_objects), ('column rows', column_rows)):
+            seconds, peak = measure(fn, engine, args.repeat)
+            print(f"  {name:<12} {seconds * 1000:8.1f} ms   peak {peak / 1024 / 1024:6.1f} MiB")
+        engine.dispose()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+# Point the app at a throwaway database before any module creates its engine
+_tmpdir = tempfile.mkdtemp(prefix='tasklist-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_tmpdir, 'todos.db')}"
+os.environ.setdefault('STYTCH_PROJECT_ID', 'project-test')
+os.environ.setdefault('STYTCH_PROJECT_SECRET', 'secret-test')
+os.environ.setdefault('STYTCH_DOMAIN', 'https://test.stytch.example')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import init_db  # noqa: E402
+
+init_db()
+
+
+@pytest.fixture
+def user_id() -> str:
+    """A fresh user, so tests never see each other's tasks or versions"""
+    return f"user-{uuid.uuid4()}"
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.auth_executor import AuthExecutor
+from app.main import app
+
+
+def test_submitted_call_runs_on_the_pool():
+    executor = AuthExecutor(max_workers=2)
+
+    result = asyncio.run(executor.run(lambda x: (x * 2, threading.current_thread().name), 21))
+
+    assert result[0] == 42
+    assert result[1].startswith('auth')
+    stats = executor.stats()
+    assert (stats['completed'], stats['pending'], stats['queue_depth'], stats['peak_queue_depth']) == (1, 0, 0, 0)
+
+
+def test_saturated_pool_queues_calls_without_blocking_the_loop():
+    executor = AuthExecutor(max_workers=1)
+    release = threading.Event()
+
+    def verify(n: int) -> int:
+        release.wait(5)
+        return n
+
+    async def run():
+        calls = [asyncio.ensure_future(executor.run(verify, n)) for n in range(3)]
+        # The loop keeps serving other work while every call waits on the pool
+        await asyncio.sleep(0.05)
+        during = executor.stats()
+        release.set()
+        return await asyncio.gather(*calls), during
+
+    results, during = asyncio.run(run())
+
+    assert results == [0, 1, 2]
+    assert (during['pending'], during['queue_depth']) == (3, 2)
+    after = executor.stats()
+    assert (after['completed'], after['pending'], after['queue_depth'], after['peak_queue_depth']) == (3, 0, 0, 2)
+    assert after['max_wait_ms'] >= 40
+
+
+def test_inline_executor_runs_calls_on_the_loop_thread():
+    executor = AuthExecutor(max_workers=0)
+
+    async def run():
+        return await executor.run(threading.get_ident), threading.get_ident()
+
+    called_on, loop_thread = asyncio.run(run())
+
+    assert called_on == loop_thread
+    assert executor.stats()['workers'] == 0
+
+
+def test_metrics_expose_auth_and_write_queue_depth():
+    metrics = TestClient(app).get('/api/metrics').json()
+
+    assert {'pending', 'queue_depth', 'peak_queue_depth', 'avg_wait_ms'} <= set(metrics['auth_executor'])
+    assert {'queue_depth', 'batches', 'avg_batch'} <= set(metrics['write_queue'])
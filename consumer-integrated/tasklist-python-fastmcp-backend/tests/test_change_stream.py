@@ -0,0 +1,32 @@
+import asyncio
+
+from app import events
+from app.services.todos import TodoService
+
+
+def next_event(stream):
+    return asyncio.wait_for(stream.__anext__(), 2)
+
+
+def test_write_between_version_read_and_first_event_is_delivered(user_id):
+    service = TodoService(user_id)
+
+    async def get_version_then_write():
+        # The stream has subscribed by now; a write committed right after the
+        # version read must still reach the client
+        version = await service.get_version()
+        await service.add_delta('racer')
+        return version
+
+    async def run():
+        stream = events.change_stream(events.broker, user_id, get_version_then_write)
+        try:
+            return [await next_event(stream) for _ in range(3)]
+        finally:
+            await stream.aclose()
+
+    retry, ready, change = asyncio.run(run())
+
+    assert retry.startswith('retry:')
+    assert ready.startswith('id: 0\nevent: ready\n')
+    assert change.startswith('id: 1\nevent: change\n')
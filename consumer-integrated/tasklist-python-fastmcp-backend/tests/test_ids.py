@@ -0,0 +1,81 @@
+import threading
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app import ids
+
+
+THREADS = 16
+IDS_PER_THREAD = 2000
+
+
+def generate_concurrently(generator, threads: int = THREADS, per_thread: int = IDS_PER_THREAD):
+    '''IDs from `threads` threads started together, as one list per thread in generation order'''
+    results = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads)
+
+    def work(out):
+        barrier.wait()
+        for _ in range(per_thread):
+            out.append(generator())
+
+    workers = [threading.Thread(target=work, args=(out,)) for out in results]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def timestamp_ms(value: str) -> int:
+    return uuid.UUID(value).int >> 80
+
+
+def assert_unique_and_ordered(results):
+    every_id = [value for out in results for value in out]
+    assert len(set(every_id)) == len(every_id)
+    for out in results:
+        # Each thread sees its IDs in strictly increasing order, as strings and as UUIDs
+        assert out == sorted(out)
+        assert all(a < b for a, b in zip(out, out[1:]))
+    for value in every_id[:100]:
+        parsed = uuid.UUID(value)
+        assert (parsed.version, parsed.variant) == (7, uuid.RFC_4122)
+
+
+def test_ids_from_many_threads_are_unique_and_ordered():
+    assert_unique_and_ordered(generate_concurrently(ids.UUIDv7Generator()))
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    now_ns = 1_760_000_000_000 * 1_000_000
+    monkeypatch.setattr(ids, 'time', SimpleNamespace(time_ns=lambda: now_ns))
+    return now_ns // 1_000_000
+
+
+def test_counter_overflow_borrows_the_next_millisecond(frozen_clock):
+    # Far more IDs than one millisecond's 12-bit counter can hold
+    results = generate_concurrently(ids.UUIDv7Generator(), threads=8, per_thread=2000)
+
+    assert_unique_and_ordered(results)
+    timestamps = {timestamp_ms(value) for out in results for value in out}
+    assert min(timestamps) == frozen_clock
+    assert max(timestamps) > frozen_clock
+
+
+def test_clock_catching_up_after_overflow_keeps_order(monkeypatch):
+    clock = {'ms': 1_760_000_000_000}
+    monkeypatch.setattr(ids, 'time', SimpleNamespace(time_ns=lambda: clock['ms'] * 1_000_000))
+    generator = ids.UUIDv7Generator()
+
+    before = [generator() for _ in range(10_000)]
+    # The generator is now ahead of the clock; the next real millisecond must not go backwards
+    clock['ms'] += 1
+    after = [generator() for _ in range(10)]
+
+    sequence = before + after
+    assert len(set(sequence)) == len(sequence)
+    assert sequence == sorted(sequence)
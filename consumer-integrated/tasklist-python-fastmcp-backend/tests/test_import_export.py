@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+
+from app import ndjson
+from app.main import app
+from app.security import LocalSession, authorize_session
+
+
+@pytest.fixture
+def client(user_id):
+    def session(request: Request):
+        request.state.user = LocalSession(user_id=user_id)
+
+    app.dependency_overrides[authorize_session] = session
+    yield TestClient(app)
+    app.dependency_overrides.pop(authorize_session, None)
+
+
+def body(*lines: str) -> bytes:
+    return '\n'.join(lines).encode()
+
+
+def export(client) -> list:
+    response = client.get('/api/tasks/export')
+    assert response.headers['content-type'] == ndjson.NDJSON_MEDIA_TYPE
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_import_reports_invalid_lines_and_export_streams_tasks(client):
+    response = client.post('/api/tasks:bulk', content=body(
+        '{"taskText": "one"}',
+        '',
+        'not json',
+        '{"taskText": "two", "completed": true}',
+        '{"completed": true}',
+    ))
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result['created'], result['failed']) == (2, 2)
+    assert [error['line'] for error in result['errors']] == [3, 5]
+    assert [(task['text'], task['completed']) for task in export(client)] == [('one', False), ('two', True)]
+
+
+def test_import_is_split_into_chunks(client, monkeypatch):
+    monkeypatch.setattr('app.routes.todos.IMPORT_CHUNK_SIZE', 2)
+
+    response = client.post('/api/tasks:bulk', content=body(*(json.dumps({'taskText': f"task {i}"}) for i in range(5))))
+
+    assert response.json()['created'] == 5
+    assert [task['text'] for task in export(client)] == [f"task {i}" for i in range(5)]
+
+
+def test_line_too_long_reports_the_tasks_already_imported(client, monkeypatch):
+    monkeypatch.setattr('app.routes.todos.IMPORT_CHUNK_SIZE', 2)
+    monkeypatch.setattr(ndjson, 'MAX_LINE_BYTES', 64)
+
+    response = client.post('/api/tasks:bulk', content=body(
+        '{"taskText": "one"}',
+        '{"taskText": "two"}',
+        '{"taskText": "three"}',
+        '{"taskText": "' + 'x' * 100 + '"}',
+        '{"taskText": "after"}',
+    ))
+
+    assert response.status_code == 413
+    result = response.json()
+    assert (result['created'], result['failed'], result['errors']) == (3, 0, [])
+    assert result['detail'] == 'Line 4 exceeds 64 bytes'
+    assert [task['text'] for task in export(client)] == ['one', 'two', 'three']
@@ -0,0 +1,74 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app import __main__ as launcher
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch):
+    # setenv first so that values the launcher sets are undone after each test
+    for name in ('MCP_STATELESS_HTTP', 'CHANGE_BROKER_REDIS_URL', 'WEB_CONCURRENCY', 'SKIP_SCHEMA_SETUP'):
+        monkeypatch.setenv(name, '')
+        monkeypatch.delenv(name)
+
+
+def test_single_worker_keeps_mcp_sessions():
+    assert launcher.configure_mcp_transport(1) is False
+    assert 'MCP_STATELESS_HTTP' not in os.environ
+
+
+def test_several_workers_default_to_stateless(caplog):
+    with caplog.at_level(logging.INFO, logger='app'):
+        assert launcher.configure_mcp_transport(4) is True
+
+    assert os.environ['MCP_STATELESS_HTTP'] == 'true'
+    assert 'resource subscriptions are off' in caplog.text
+    assert 'CHANGE_BROKER_REDIS_URL is not set' in caplog.text
+
+
+def test_explicit_stateful_setting_is_kept_with_a_warning(monkeypatch, caplog):
+    monkeypatch.setenv('MCP_STATELESS_HTTP', 'false')
+    monkeypatch.setenv('CHANGE_BROKER_REDIS_URL', 'redis://localhost:6379/0')
+
+    with caplog.at_level(logging.INFO, logger='app'):
+        assert launcher.configure_mcp_transport(4) is False
+
+    assert os.environ['MCP_STATELESS_HTTP'] == 'false'
+    assert [r.levelname for r in caplog.records] == ['WARNING']
+    assert 'MCP sessions will fail' in caplog.text
+
+
+def test_main_runs_uvicorn_with_the_chosen_mode(monkeypatch):
+    runs = []
+    monkeypatch.setenv('WEB_CONCURRENCY', '2')
+    monkeypatch.setenv('SKIP_SCHEMA_SETUP', 'true')
+    monkeypatch.setattr(launcher.uvicorn, 'run', lambda app, **options: runs.append((app, options)))
+
+    launcher.main()
+
+    assert runs == [('app.main:app', {'host': '127.0.0.1', 'port': 3001, 'workers': 2})]
+    # Inherited by the worker processes
+    assert os.environ['MCP_STATELESS_HTTP'] == 'true'
+
+
+@pytest.mark.parametrize('stateless, subscribe', [('true', False), ('false', True)])
+def test_subscriptions_are_advertised_only_when_stateful(stateless, subscribe):
+    script = (
+        'import asyncio, fastmcp\n'
+        'from app import mcp_server\n'
+        'async def run():\n'
+        '    async with fastmcp.Client(mcp_server.mcp) as client:\n'
+        '        print(client.initialize_result.capabilities.resources.subscribe)\n'
+        'asyncio.run(run())\n'
+    )
+    env = {**os.environ, 'MCP_STATELESS_HTTP': stateless}
+    result = subprocess.run([sys.executable, '-c', script], cwd=APP_DIR, env=env, capture_output=True, text=True, check=True)
+
+    assert json.loads(result.stdout.strip().splitlines()[-1].lower()) is subscribe
@@ -0,0 +1,73 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import list_cache
+from app.main import app
+from app.services.todos import TodoService
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh cache, so hit and miss counts belong to the test"""
+    fresh = list_cache.ListCache(list_cache.InMemoryCacheBackend())
+    monkeypatch.setattr(list_cache, 'cache', fresh)
+    return fresh
+
+
+def texts(service: TodoService):
+    return [task.text for task in asyncio.run(service.get())]
+
+
+def test_repeated_reads_are_served_from_the_cache(cache, user_id):
+    service = TodoService(user_id)
+    service._add_delta('first')
+
+    assert texts(service) == ['first']
+    assert texts(service) == ['first']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_write_invalidates_through_the_version_bump(cache, user_id, monkeypatch):
+    service = TodoService(user_id)
+    service._add_delta('first')
+    assert texts(service) == ['first']
+
+    # As if the write ran on another worker: this worker's entry is never dropped
+    monkeypatch.setattr(cache, 'invalidate', lambda tenant: None)
+    service._add_delta('second')
+
+    assert texts(service) == ['first', 'second']
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_tenants_at_the_same_version_never_share_entries(cache):
+    alice, bob = TodoService(f"user-{uuid.uuid4()}"), TodoService(f"user-{uuid.uuid4()}")
+    alice._add_delta("alice's task")
+    bob._add_delta("bob's task")
+    assert asyncio.run(alice.get_version()) == asyncio.run(bob.get_version())
+
+    assert texts(alice) == ["alice's task"]
+    assert texts(bob) == ["bob's task"]
+    assert texts(alice) == ["alice's task"]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_entry_of_another_version_is_a_miss(cache):
+    cache.put('user', 'tasks', 1, ['old'])
+
+    assert cache.get('user', 'tasks', 2) is None
+    assert cache.get('user', 'tasks', 1) == ['old']
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'size': 1}
+
+
+def test_hit_rate_is_exposed(cache, user_id):
+    service = TodoService(user_id)
+    texts(service)
+    texts(service)
+
+    stats = TestClient(app).get('/api/metrics').json()['list_cache']
+
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
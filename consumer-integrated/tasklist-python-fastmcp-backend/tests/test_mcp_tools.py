@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from fastmcp import Client
+
+from app import mcp_server
+
+
+@pytest.fixture
+def mcp_user(user_id, monkeypatch):
+    # The in-memory transport carries no bearer token
+    monkeypatch.setattr(mcp_server, '_get_user_id_from_token', lambda: user_id)
+    return user_id
+
+
+def call(name: str, arguments: dict):
+    async def run():
+        async with Client(mcp_server.mcp) as client:
+            tools = {tool.name: tool for tool in await client.list_tools()}
+            result = await client.call_tool(name, arguments)
+            return tools[name], result
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('name', ['createTask', 'markTaskComplete', 'deleteTask'])
+def test_full_mode_tools_keep_the_legacy_schema(name):
+    async def run():
+        async with Client(mcp_server.mcp) as client:
+            return {tool.name: tool for tool in await client.list_tools()}[name]
+    tool = asyncio.run(run())
+
+    assert set(tool.outputSchema['properties']) == {'tasks'}
+    assert 'responseMode' not in tool.inputSchema['properties']
+
+
+def test_create_task_returns_the_legacy_payload(mcp_user):
+    _, result = call('createTask', {'taskText': 'write tests'})
+
+    assert set(result.structured_content) == {'tasks'}
+    [task] = result.structured_content['tasks']
+    assert (task['text'], task['completed']) == ('write tests', False)
+
+
+def test_delta_tools_return_the_change(mcp_user):
+    tool, result = call('createTaskDelta', {'taskText': 'write tests'})
+
+    assert set(tool.outputSchema['properties']) == {'task', 'deletedId', 'version'}
+    assert result.structured_content['task']['text'] == 'write tests'
+    assert result.structured_content['version'] == 1
+
+    task_id = result.structured_content['task']['id']
+    _, result = call('deleteTaskDelta', {'taskID': task_id})
+    assert result.structured_content == {'task': None, 'deletedId': task_id, 'version': 2}
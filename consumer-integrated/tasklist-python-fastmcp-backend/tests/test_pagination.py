@@ -0,0 +1,57 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from fastmcp import Client
+from mcp.shared.exceptions import McpError
+from sqlalchemy import update
+
+from app import list_cache, mcp_server, pagination
+from app.db import SessionLocal
+from app.models import TaskORM
+from app.services.todos import TodoService
+
+
+@pytest.fixture
+def task_ids(user_id, monkeypatch):
+    """Five tasks of one user, all created in the same second, the second one completed"""
+    monkeypatch.setattr(mcp_server, '_get_user_id_from_token', lambda: user_id)
+    monkeypatch.setattr(pagination, 'DEFAULT_PAGE_SIZE', 2)
+    service = TodoService(user_id)
+    ids = [service._add_delta(f"task {i}").task.id for i in range(5)]
+    service._mark_completed_delta(ids[1])
+    with SessionLocal() as session:
+        session.execute(update(TaskORM).where(TaskORM.user_id == user_id).values(created_at=datetime(2024, 1, 1, 12)))
+        session.commit()
+    list_cache.cache.invalidate(user_id)
+    return ids
+
+
+def read(uri: str) -> dict:
+    async def run():
+        async with Client(mcp_server.mcp) as client:
+            return json.loads((await client.read_resource(uri))[0].text)
+    return asyncio.run(run())
+
+
+def test_walk_all_pages_with_ties_on_created_at(task_ids):
+    seen, pages = [], 0
+    page = read('resource://tasks')
+    while True:
+        seen += [task['id'] for task in page['tasks']]
+        pages += 1
+        if page['nextCursor'] is None:
+            break
+        page = read(f"resource://tasks/page/{page['nextCursor']}")
+
+    # Incomplete tasks first; tasks created in the same second are ordered by id
+    assert seen == [task_ids[0], task_ids[2], task_ids[3], task_ids[4], task_ids[1]]
+    assert pages == 3
+
+
+def test_invalid_cursor_is_rejected(task_ids):
+    with pytest.raises(McpError, match='Invalid cursor'):
+        read('resource://tasks/page/not-a-cursor')
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        pagination.decode_cursor(pagination.encode_cursor(0, datetime(2024, 1, 1), 'id')[:-4])
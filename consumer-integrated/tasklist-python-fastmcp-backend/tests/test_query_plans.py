@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import event
+
+from app import list_cache
+from app.db import read_engine
+from app.services.todos import TodoService
+
+
+def query_plans(call) -> list:
+    """EXPLAIN QUERY PLAN of every task query `call` sends through the read pool"""
+    queries = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM tasks' in statement:
+            queries.append((statement, parameters))
+
+    event.listen(read_engine, 'before_cursor_execute', capture)
+    try:
+        call()
+    finally:
+        event.remove(read_engine, 'before_cursor_execute', capture)
+    assert queries, 'no task query was captured'
+
+    plans = []
+    with read_engine.connect() as connection:
+        for statement, parameters in queries:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append('\n'.join(row[-1] for row in rows))
+    return plans
+
+
+@pytest.fixture(autouse=True)
+def uncached(monkeypatch):
+    # Every read goes to the database
+    monkeypatch.setattr(list_cache.cache, 'get', lambda *args: None)
+
+
+def test_pages_walk_the_keyset_index(user_id):
+    service = TodoService(user_id)
+    for i in range(5):
+        service._add_delta(f"task {i}")
+    _, next_key, _ = service._get_page(2, None)
+
+    for after in (None, next_key):
+        for plan in query_plans(lambda: service._get_page(2, after)):
+            assert 'USING INDEX ix_tasks_user_completed_created_id' in plan
+            # The index order is the page order: no sort of the user's tasks
+            assert 'TEMP B-TREE' not in plan
+
+
+def test_full_list_walks_the_keyset_index(user_id):
+    service = TodoService(user_id)
+    service._add_delta('task')
+
+    for plan in query_plans(service._get):
+        assert 'USING INDEX ix_tasks_user_completed_created_id' in plan
+        assert 'TEMP B-TREE' not in plan
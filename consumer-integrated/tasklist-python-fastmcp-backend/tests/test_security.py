@@ -0,0 +1,172 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException, Request
+
+from app import security
+from app.jwks import JWKSCache, SessionJWTVerifier
+
+PROJECT_ID = 'project-test-security'
+ISSUER = f"stytch.com/{PROJECT_ID}"
+
+
+def make_key(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid=kid, use='sig', alg='RS256')
+    return private_key, jwk
+
+
+KEYS = {kid: make_key(kid) for kid in ('key-1', 'key-2')}
+
+
+def make_token(kid: str = 'key-1', expires_in: float = 300.0, **claims) -> str:
+    payload = {
+        'sub': 'user-1',
+        'aud': [PROJECT_ID],
+        'iss': ISSUER,
+        'exp': int(time.time() + expires_in),
+        security.SESSION_CLAIM: {'id': 'session-1'},
+        **claims,
+    }
+    return jwt.encode(payload, KEYS[kid][0], algorithm='RS256', headers={'kid': kid})
+
+
+class FakeJWKS:
+    """Serves a JWKS document on localhost and counts how often it was fetched"""
+
+    def __init__(self):
+        self.kids = ['key-1']
+        self.fetches = 0
+        jwks = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                jwks.fetches += 1
+                body = json.dumps({'keys': [KEYS[kid][1] for kid in jwks.kids]}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.uri = f"http://127.0.0.1:{self.server.server_port}/jwks"
+
+
+class FakeStytch:
+    """Stands in for the Stytch client; records the JWTs sent to `sessions.authenticate`"""
+
+    def __init__(self, error: Exception | None = None):
+        self.authenticated = []
+        self.error = error
+        self.sessions = SimpleNamespace(authenticate=self.authenticate)
+
+    def authenticate(self, session_jwt: str):
+        self.authenticated.append(session_jwt)
+        if self.error:
+            raise self.error
+        return SimpleNamespace(session=SimpleNamespace(user_id='user-from-stytch'))
+
+
+@pytest.fixture
+def fake_jwks(monkeypatch):
+    jwks = FakeJWKS()
+    thread = threading.Thread(target=jwks.server.serve_forever, daemon=True)
+    thread.start()
+    verifier = SessionJWTVerifier(
+        project_id=PROJECT_ID,
+        jwks_uri=jwks.uri,
+        issuers=[ISSUER],
+        jwks=JWKSCache(jwks.uri, min_refetch_interval_seconds=0.0),
+    )
+    monkeypatch.setattr(security, '_verifier', verifier)
+    yield jwks
+    jwks.server.shutdown()
+    jwks.server.server_close()
+
+
+@pytest.fixture
+def stytch(monkeypatch):
+    client = FakeStytch()
+    monkeypatch.setattr(security, '_client', client)
+    return client
+
+
+def authorize(token: str | None) -> Request:
+    headers = [(b'cookie', f"stytch_session_jwt={token}".encode())] if token else []
+    request = Request({'type': 'http', 'headers': headers})
+    asyncio.run(security.authorize_session(request))
+    return request
+
+
+def test_valid_token_is_verified_locally(fake_jwks, stytch):
+    request = authorize(make_token())
+
+    assert request.state.user == security.LocalSession(user_id='user-1', session_id='session-1')
+    assert stytch.authenticated == []
+
+
+def test_expired_token_falls_back_to_stytch(fake_jwks, stytch):
+    token = make_token(expires_in=-60.0)
+
+    request = authorize(token)
+
+    # The JWT is expired but the session behind it may still be active
+    assert request.state.user.user_id == 'user-from-stytch'
+    assert stytch.authenticated == [token]
+
+
+def test_unknown_kid_refetches_the_keys(fake_jwks, stytch):
+    authorize(make_token('key-1'))
+    # The signing key rotates after the first fetch
+    fake_jwks.kids.append('key-2')
+
+    request = authorize(make_token('key-2', sub='user-2'))
+
+    assert request.state.user.user_id == 'user-2'
+    assert fake_jwks.fetches == 2
+    assert stytch.authenticated == []
+
+
+def test_kid_missing_after_refetch_falls_back_to_stytch(fake_jwks, stytch):
+    token = make_token('key-2')
+
+    request = authorize(token)
+
+    assert request.state.user.user_id == 'user-from-stytch'
+    assert stytch.authenticated == [token]
+
+
+def test_invalid_token_is_rejected_without_calling_stytch(fake_jwks, stytch):
+    # Claims to be key-1 but is signed with key-2
+    token = jwt.encode(
+        {'sub': 'user-1', 'aud': [PROJECT_ID], 'iss': ISSUER, 'exp': int(time.time() + 300)},
+        KEYS['key-2'][0],
+        algorithm='RS256',
+        headers={'kid': 'key-1'},
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        authorize(token)
+    assert exc_info.value.status_code == 401
+    assert stytch.authenticated == []
+
+
+def test_missing_cookie_or_rejected_session_is_unauthorized(fake_jwks, monkeypatch):
+    monkeypatch.setattr(security, '_client', FakeStytch(error=RuntimeError('session not found')))
+
+    for token in (None, make_token(expires_in=-60.0)):
+        with pytest.raises(HTTPException) as exc_info:
+            authorize(token)
+        assert exc_info.value.status_code == 401
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+from app import list_cache
+from app.db import SessionLocal
+from app.models import TaskORM
+from app.services.todos import TodoService
+
+
+def insert_legacy_task(user_id: str, text: str, created_at: datetime) -> str:
+    """A task as written before UUIDv7 IDs: the ID is the creation time in milliseconds"""
+    task_id = str(int(created_at.timestamp() * 1000))
+    with SessionLocal() as session:
+        session.add(TaskORM(id=task_id, user_id=user_id, text=text, completed=0, created_at=created_at))
+        session.commit()
+    return task_id
+
+
+def test_tasks_created_after_the_upgrade_list_after_legacy_tasks(user_id):
+    service = TodoService(user_id)
+    earlier = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=1)
+    insert_legacy_task(user_id, 'legacy one', earlier)
+    insert_legacy_task(user_id, 'legacy two', earlier + timedelta(minutes=1))
+    # The version bump invalidates cached lists; the legacy rows were inserted behind its back
+    list_cache.cache.invalidate(user_id)
+    service._add_delta('new one')
+    service._add_delta('new two')
+
+    assert [task.text for task in asyncio.run(service.get())] == ['legacy one', 'legacy two', 'new one', 'new two']
+
+    texts, after = [], None
+    while True:
+        page, after, _ = service._get_page(1, after)
+        texts += [task.text for task in page]
+        if after is None:
+            break
+    assert texts == ['legacy one', 'legacy two', 'new one', 'new two']
+
+
+def test_concurrent_inserts_get_unique_ids_in_creation_order(user_id):
+    service = TodoService(user_id)
+    threads, per_thread = 8, 25
+    created = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads)
+
+    def work(n: int) -> None:
+        barrier.wait()
+        for i in range(per_thread):
+            created[n].append(service._add_delta(f"{n}:{i}").task.id)
+
+    workers = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    listed = [task.id for task in asyncio.run(service.get())]
+    assert len(listed) == len(set(listed)) == threads * per_thread
+    assert asyncio.run(service.get_version()) == threads * per_thread
+    position = {task_id: i for i, task_id in enumerate(listed)}
+    for ids in created:
+        # Each thread's tasks are listed in the order that thread created them
+        assert [position[task_id] for task_id in ids] == sorted(position[task_id] for task_id in ids)
@@ -0,0 +1,67 @@
+import asyncio
+
+from app import events, list_cache
+from app.db import ReadSessionLocal
+from app.services.todos import TodoService
+from app.write_queue import WriteQueue
+
+
+def committed_version(service: TodoService) -> int:
+    """List version as another connection sees it"""
+    with ReadSessionLocal() as session:
+        return service._current_version(session)
+
+
+def test_batch_publishes_only_committed_versions(user_id):
+    service = TodoService(user_id)
+    seen = []
+    unsubscribe = events.broker.subscribe(user_id, lambda event: seen.append((event.version, committed_version(service))))
+    queue = WriteQueue(max_batch=8, window_seconds=0.05)
+
+    async def run():
+        return await asyncio.gather(*(queue.submit(service._add_delta, f"t{i}") for i in range(4)))
+
+    try:
+        changes = asyncio.run(run())
+    finally:
+        unsubscribe()
+
+    assert queue.batches == 1
+    assert sorted(change.version for change in changes) == [1, 2, 3, 4]
+    assert [version for version, _ in seen] == [1, 2, 3, 4]
+    # Every event is published after the batch commit, so readers already see its version
+    assert all(visible >= version for version, visible in seen)
+
+
+def test_failed_write_keeps_neighbours_callbacks(user_id, monkeypatch):
+    service = TodoService(user_id)
+    invalidated = []
+    monkeypatch.setattr(list_cache.cache, 'invalidate', lambda tenant: invalidated.append(tenant))
+    published = []
+    unsubscribe = events.broker.subscribe(user_id, published.append)
+    queue = WriteQueue(max_batch=8, window_seconds=0.05)
+
+    def add_then_fail():
+        service._add_delta('doomed')
+        raise RuntimeError('boom')
+
+    async def run():
+        return await asyncio.gather(
+            queue.submit(service._add_delta, 'first'),
+            queue.submit(add_then_fail),
+            queue.submit(service._add_delta, 'last'),
+            return_exceptions=True,
+        )
+
+    try:
+        first, failed, last = asyncio.run(run())
+    finally:
+        unsubscribe()
+
+    assert queue.batches == 1
+    assert isinstance(failed, RuntimeError)
+    assert (first.version, last.version) == (1, 2)
+    assert [event.version for event in published] == [1, 2]
+    assert invalidated == [user_id, user_id]
+    assert committed_version(service) == 2
+    assert sorted(task.text for task in asyncio.run(service.get())) == ['first', 'last']